@@ -5,24 +5,40 @@ Flask API Application for Install Scripts
 This API provides endpoints to manage and list installation scripts.
 
 Usage:
-    python app.py [--port PORT] [--host HOST]
+    python app.py [--port PORT] [--host HOST] [--debug]
 
 Arguments:
     --port PORT  Port to run the server on (default: 5000)
     --host HOST  Host to bind the server to (default: 0.0.0.0)
+    --debug      Run in debug mode (default: off)
+
+Production:
+    gunicorn --workers 4 --worker-class gthread --threads 8 --preload app:app
 """
 
 import os
 import re
+import gzip
 import json
+import math
+import mmap
+import select
+import shlex
+import socket
 import time
 import argparse
 import logging
 import hashlib
+import hmac
 import threading
+import atexit
 from typing import Optional
-from functools import wraps
-from flask import Flask, jsonify, request
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
+from flask import Flask, Response, jsonify, request
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.exceptions import HTTPException, RequestEntityTooLarge
+from werkzeug.middleware.proxy_fix import ProxyFix
 from dotenv import load_dotenv
 from rate_limiter import RateLimiter
 
@@ -37,6 +53,14 @@ except ImportError:
     SSH_AVAILABLE = False
     paramiko = None
 
+# orjson imports - optional, speeds up data file parsing and response serialization
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
 app = Flask(__name__)
 
 # Configuration
@@ -44,8 +68,31 @@ SCRIPTS_DIR = os.environ.get('SCRIPTS_DIR', os.path.join(os.path.dirname(os.path
 DATA_DIR = os.environ.get('DATA_DIR', os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 DEFAULT_LANG = 'ru'
 SCRIPTS_BASE_URL = os.environ.get('SCRIPTS_BASE_URL', 'https://raw.githubusercontent.com/andchir/install_scripts/refs/heads/main/scripts')
+
+# Send installation scripts from SCRIPTS_DIR over the SSH connection instead of
+# downloading them from SCRIPTS_BASE_URL on the target server
+SCRIPTS_UPLOAD = os.environ.get('SCRIPTS_UPLOAD', 'false').lower() in ('true', '1', 'yes')
 SSH_DEFAULT_PORT = 22
-SSH_DEFAULT_TIMEOUT = 30
+
+# SSH connection timeouts (in seconds), so unreachable or unresponsive servers fail fast
+SSH_DEFAULT_TIMEOUT = int(os.environ.get('SSH_CONNECT_TIMEOUT', '10'))  # TCP connect
+SSH_BANNER_TIMEOUT = int(os.environ.get('SSH_BANNER_TIMEOUT', '10'))  # SSH banner after connect
+SSH_AUTH_TIMEOUT = int(os.environ.get('SSH_AUTH_TIMEOUT', '15'))  # password authentication
+
+# Interval (in seconds) of SSH keepalive packets on open connections (0 disables keepalive)
+# Keeps long-running installations and pooled connections from being dropped by NAT/firewalls
+SSH_KEEPALIVE_INTERVAL = int(os.environ.get('SSH_KEEPALIVE_INTERVAL', '15'))
+
+# Size of the chunks read from SSH channels
+SSH_READ_CHUNK_SIZE = 65536
+
+# Maximum size of script output kept in memory by execute_script_via_ssh (only the tail is kept)
+SSH_MAX_OUTPUT_BYTES = int(os.environ.get('SSH_MAX_OUTPUT_BYTES', str(1024 * 1024)))
+
+# SSH connection pool configuration
+# Idle connections are kept per (server_ip, port, password) and reused by later installs
+SSH_POOL_IDLE_TIMEOUT = int(os.environ.get('SSH_POOL_IDLE_TIMEOUT', '300'))  # 0 disables pooling
+SSH_POOL_MAX_IDLE = int(os.environ.get('SSH_POOL_MAX_IDLE', '4'))  # per server
 
 # Tasks directory for storing task reports
 TASKS_DIR = os.environ.get('TASKS_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tasks'))
@@ -58,10 +105,37 @@ TASK_STATUS_PROCESSING = 'processing'
 TASK_STATUS_COMPLETED = 'completed'
 TASK_STATUS_ERROR = 'error'
 
+# Width of the status line of task report files (without the newline), fits every status
+_TASK_STATUS_LINE_WIDTH = len('STATUS:') + max(
+    len(TASK_STATUS_PROCESSING), len(TASK_STATUS_COMPLETED), len(TASK_STATUS_ERROR)
+)
+
 # Task file cleanup configuration (in seconds)
 # Files older than this will be deleted when /api/install is called
 TASK_FILE_MAX_AGE_SECONDS = int(os.environ.get('TASK_FILE_MAX_AGE_SECONDS', '1800'))  # 30 minutes
 
+# Load data files into memory at import time (shared by gunicorn workers with --preload)
+PRELOAD_DATA = os.environ.get('PRELOAD_DATA', 'true').lower() in ('true', '1', 'yes')
+
+# Max-age (in seconds) for client caching of /api/scripts_list and /api/script/<script_name>
+# Clients can revalidate with If-None-Match to get 304 Not Modified when the data is unchanged
+DATA_CACHE_MAX_AGE = int(os.environ.get('DATA_CACHE_MAX_AGE', '60'))
+
+# Maximum number of installations executed concurrently in background threads
+# Further installations are queued until a worker becomes available
+INSTALL_WORKERS = int(os.environ.get('INSTALL_WORKERS', '32'))
+
+# Maximum number of installations waiting for a worker
+# When the queue is full, /api/install is rejected with 503 instead of queueing without limit
+INSTALL_QUEUE_SIZE = int(os.environ.get('INSTALL_QUEUE_SIZE', '100'))
+
+# Maximum size of request bodies in bytes (larger requests are rejected with 413)
+MAX_REQUEST_BODY_SIZE = int(os.environ.get('MAX_REQUEST_BODY_SIZE', '8192'))
+
+# Number of reverse proxies (e.g. nginx) in front of the API whose X-Forwarded-For entries are trusted
+# 0 means the API is accessed directly and the client IP is the socket address
+TRUSTED_PROXY_HOPS = int(os.environ.get('TRUSTED_PROXY_HOPS', '1'))
+
 # API Key configuration
 API_KEY = os.environ.get('API_KEY', '')
 
@@ -74,9 +148,71 @@ RATE_LIMITER_DB_PATH = os.environ.get(
     os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rate_limiter.db')
 )
 
+# Maximum number of records returned by one /api/protection/stats request
+# (older records are fetched page by page with the 'before' parameter)
+REQUEST_STATS_MAX_LIMIT = 5000
+
+# Maximum number of IP addresses in one /api/protection/block_bulk or unblock_bulk request
+BULK_BLOCK_MAX_IPS = 5000
+
+# Maximum duration of a temporary block in hours (10 years; use permanent blocks for longer)
+MAX_BLOCK_DURATION_HOURS = 24 * 365 * 10
+
+# Maximum size of bulk block/unblock request bodies in bytes: about 20 bytes per
+# address ("255.255.255.255", plus separators) and room for the other fields
+BULK_BLOCK_MAX_BODY_SIZE = BULK_BLOCK_MAX_IPS * 20 + MAX_REQUEST_BODY_SIZE
+
+# Reject oversized request bodies before they are read and parsed
+app.config['MAX_CONTENT_LENGTH'] = MAX_REQUEST_BODY_SIZE
+
+# Resolve the client IP from X-Forwarded-For once per request, trusting only
+# the entries added by our own proxies (request.remote_addr is the client IP)
+if TRUSTED_PROXY_HOPS > 0:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=TRUSTED_PROXY_HOPS)
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Idle SSH connections: {(server_ip, port, password_hash): [(ssh_client, released_at), ...]}
+_ssh_pool = {}
+_ssh_pool_lock = threading.Lock()
+
+# Required fields of the /api/install request body
+_REQUIRED_INSTALL_FIELDS = ('script_name', 'server_ip', 'server_root_password')
+
+# Task IDs are BLAKE2b-128 hashes (32 hex characters), matched with fullmatch()
+# ('$' would also accept a trailing newline)
+_TASK_ID_RE = re.compile(r'[a-f0-9]{32}')
+
+# Script names: ASCII letters, digits, hyphens and underscores, matched with fullmatch()
+_SCRIPT_NAME_RE = re.compile(r'[A-Za-z0-9_-]+')
+
+# ANSI escape sequences (colors, cursor movement, screen clearing) in script output
+_ANSI_ESCAPE_RE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+
+# Control characters other than tab, newline and carriage return (NUL, BEL, backspace, lone ESC, DEL, ...)
+_CONTROL_CHARS_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]')
+
+# Byte-level equivalents used for raw script output; all of the removed bytes
+# are ASCII, so stripping them never splits a multi-byte UTF-8 character
+_ANSI_ESCAPE_RE_B = re.compile(rb'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+_CONTROL_BYTES = bytes(range(0x00, 0x09)) + b'\x0b\x0c' + bytes(range(0x0e, 0x20)) + b'\x7f'
+
+# Background executor for installation tasks
+install_executor = ThreadPoolExecutor(max_workers=INSTALL_WORKERS, thread_name_prefix='install')
+
+# Slots for running and queued installations; released when an installation finishes
+_install_slots = threading.BoundedSemaphore(INSTALL_WORKERS + INSTALL_QUEUE_SIZE)
+
+# In-memory cache of parsed data files and their serialized responses, keyed by path
+_DATA_CACHE = {}
+_DATA_CACHE_LOCK = threading.Lock()
+
+# In-memory cache of installation scripts read from SCRIPTS_DIR:
+# {path: (mtime_ns, size, script_bytes, sha256_hexdigest)}
+_SCRIPT_FILE_CACHE = {}
+_SCRIPT_FILE_CACHE_LOCK = threading.Lock()
+
 # Initialize rate limiter
 rate_limiter = RateLimiter(
     db_path=RATE_LIMITER_DB_PATH,
@@ -88,7 +224,7 @@ rate_limiter = RateLimiter(
 
 def generate_task_id(script_name, server_ip, server_root_password, additional=''):
     """
-    Generate a unique task ID based on MD5 hash of all input parameters.
+    Generate a unique task ID based on a BLAKE2b-128 hash of all input parameters.
 
     Args:
         script_name: Name of the script to execute
@@ -97,17 +233,76 @@ def generate_task_id(script_name, server_ip, server_root_password, additional=''
         additional: Additional parameters to pass to the script
 
     Returns:
-        str: MD5 hash string to be used as task_id
+        str: Hash string (32 hex characters) to be used as task_id
     """
     data = f"{script_name}:{server_ip}:{server_root_password}:{additional}"
-    return hashlib.md5(data.encode('utf-8')).hexdigest()
+    return hashlib.blake2b(data.encode('utf-8'), digest_size=16).hexdigest()
 
 
 def strip_ansi_codes(text: Optional[str]) -> Optional[str]:
-    ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-    result = ansi_escape.sub('', text)
+    """
+    Remove ANSI escape codes and non-printable control characters from text.
+
+    Tabs, newlines and carriage returns are preserved. Text without escape
+    sequences skips the ANSI pass, and text without control characters is
+    returned unchanged.
+
+    Args:
+        text: Text that may contain terminal escape sequences (or None)
+
+    Returns:
+        Cleaned text, or the input itself if it is None or empty
+    """
+    if not text:
+        return text
 
-    return result
+    if '\x1b' in text:
+        text = _ANSI_ESCAPE_RE.sub('', text)
+
+    return _CONTROL_CHARS_RE.sub('', text)
+
+
+def strip_ansi_bytes(data: bytes) -> bytes:
+    """
+    Remove ANSI escape codes and non-printable control characters from bytes.
+
+    Works like strip_ansi_codes() on raw UTF-8 output without decoding it.
+    Control characters are removed with bytes.translate(), and the regex
+    pass only runs for data that contains an ESC byte.
+
+    Args:
+        data: Raw output that may contain terminal escape sequences
+
+    Returns:
+        bytes: Cleaned output
+    """
+    if b'\x1b' in data:
+        data = _ANSI_ESCAPE_RE_B.sub(b'', data)
+    return data.translate(None, _CONTROL_BYTES)
+
+
+def is_valid_ipv4(value) -> bool:
+    """
+    Check whether a value is a valid IPv4 address in dotted-decimal notation.
+
+    Uses socket.inet_pton(), a single C call with strict parsing: octet
+    ranges are validated (e.g. 999.999.999.999 is rejected), as are
+    shortened forms, leading zeros and surrounding whitespace.
+
+    Args:
+        value: The value to check
+
+    Returns:
+        True if the value is a valid IPv4 address string
+    """
+    if not isinstance(value, str):
+        return False
+    try:
+        socket.inet_pton(socket.AF_INET, value)
+    except (OSError, ValueError):
+        # ValueError is raised for strings with embedded null characters
+        return False
+    return True
 
 
 def escape_shell_args(additional: str) -> str:
@@ -115,7 +310,7 @@ def escape_shell_args(additional: str) -> str:
     Escape and format additional parameters for shell execution.
 
     If the additional parameter contains spaces, it is split into multiple
-    arguments. Each argument is properly escaped and quoted with single quotes.
+    arguments. Each argument is quoted with shlex.quote.
 
     Args:
         additional: The additional parameter string (may contain spaces)
@@ -127,15 +322,7 @@ def escape_shell_args(additional: str) -> str:
         return ''
 
     # Split by whitespace to get individual arguments
-    args = additional.split()
-
-    # Escape each argument: replace single quotes with '\''
-    escaped_args = []
-    for arg in args:
-        escaped_arg = arg.replace("'", "'\"'\"'")
-        escaped_args.append(f"'{escaped_arg}'")
-
-    return ' '.join(escaped_args)
+    return ' '.join(shlex.quote(arg) for arg in additional.split())
 
 
 def get_task_file_path(task_id):
@@ -167,10 +354,49 @@ def write_task_status(task_id, status, content=''):
     # Strip ANSI escape codes from content for clean text output
     clean_content = strip_ansi_codes(content) if content else ''
     with open(task_file, 'w', encoding='utf-8') as f:
-        f.write(f"STATUS:{status}\n")
+        f.write(_task_status_line(status))
         f.write(clean_content)
 
 
+def _task_status_line(status):
+    """
+    Build the status line of a task report file.
+
+    The line is padded to a fixed width so the status can later be
+    overwritten in place (see finish_task()).
+
+    Args:
+        status: Task status
+
+    Returns:
+        str: Status line including the trailing newline
+    """
+    return f"STATUS:{status}".ljust(_TASK_STATUS_LINE_WIDTH) + '\n'
+
+
+def finish_task(task_id, status, message=''):
+    """
+    Set the final status of a task and append a message to its report.
+
+    The status line is overwritten in place and the message is appended, so
+    the content already written to the report is neither read nor rewritten.
+
+    Args:
+        task_id: The task ID
+        status: Final status (completed, error)
+        message: Content to append to the report
+    """
+    task_file = get_task_file_path(task_id)
+    try:
+        with open(task_file, 'r+', encoding='utf-8') as f:
+            f.write(_task_status_line(status))
+            f.seek(0, os.SEEK_END)
+            _write_task_content(f, message)
+    except FileNotFoundError:
+        # The report was removed while the task was running
+        write_task_status(task_id, status, message)
+
+
 def append_task_content(task_id, content):
     """
     Append content to the task report file without changing status.
@@ -183,10 +409,20 @@ def append_task_content(task_id, content):
         content: Content to append to the report
     """
     task_file = get_task_file_path(task_id)
-    # Strip ANSI escape codes from content for clean text output
-    clean_content = strip_ansi_codes(content) if content else ''
     with open(task_file, 'a', encoding='utf-8') as f:
-        f.write(clean_content)
+        _write_task_content(f, content)
+
+
+def _write_task_content(report_file, content):
+    """
+    Write content to an open task report file, stripping ANSI escape codes.
+
+    Args:
+        report_file: Task report file opened for appending
+        content: Content to append to the report
+    """
+    if content:
+        report_file.write(strip_ansi_codes(content))
 
 
 def read_task_status(task_id):
@@ -200,22 +436,44 @@ def read_task_status(task_id):
         tuple: (status, content) or (None, None) if not found
     """
     task_file = get_task_file_path(task_id)
-    if not os.path.exists(task_file):
+    try:
+        with open(task_file, 'r', encoding='utf-8', errors='replace') as f:
+            content = f.read()
+    except FileNotFoundError:
         return None, None
 
-    with open(task_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-
     # Parse status from the first line
-    lines = content.split('\n', 1)
-    if lines and lines[0].startswith('STATUS:'):
-        status = lines[0].replace('STATUS:', '').strip()
-        result_content = lines[1] if len(lines) > 1 else ''
-        return status, result_content
+    header, _, result_content = content.partition('\n')
+    if header.startswith('STATUS:'):
+        return header[len('STATUS:'):].strip(), result_content
 
     return None, None
 
 
+def open_task_report(task_id):
+    """
+    Open a task report file and read only its status line.
+
+    Args:
+        task_id: The task ID
+
+    Returns:
+        tuple: (status, report_file) with report_file positioned at the start
+        of the content (the caller must close it), or (None, None) if not found
+    """
+    try:
+        report_file = open(get_task_file_path(task_id), 'r', encoding='utf-8', errors='replace')
+    except FileNotFoundError:
+        return None, None
+
+    header = report_file.readline()
+    if not header.startswith('STATUS:'):
+        report_file.close()
+        return None, None
+
+    return header[len('STATUS:'):].strip(), report_file
+
+
 def delete_task_file(task_id):
     """
     Delete the task report file.
@@ -223,9 +481,10 @@ def delete_task_file(task_id):
     Args:
         task_id: The task ID
     """
-    task_file = get_task_file_path(task_id)
-    if os.path.exists(task_file):
-        os.remove(task_file)
+    try:
+        os.remove(get_task_file_path(task_id))
+    except FileNotFoundError:
+        pass
 
 
 def cleanup_old_task_files(max_age_seconds=None):
@@ -251,32 +510,45 @@ def cleanup_old_task_files(max_age_seconds=None):
     current_time = time.time()
 
     try:
-        if not os.path.exists(TASKS_DIR):
-            return 0
+        # scandir() yields the names and paths in one pass over the directory
+        # (no separate existence check and path joining per file)
+        with os.scandir(TASKS_DIR) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.txt'):
+                    continue
+
+                try:
+                    # Get file modification time
+                    file_age = current_time - entry.stat().st_mtime
+
+                    if file_age > max_age_seconds:
+                        os.remove(entry.path)
+                        deleted_count += 1
+                        logger.info(f"Deleted old task file: {entry.name} (age: {file_age:.0f}s)")
+                except OSError as e:
+                    logger.warning(f"Error processing task file {entry.name}: {str(e)}")
+                    continue
+
+    except FileNotFoundError:
+        return 0
+    except OSError as e:
+        logger.error(f"Error accessing tasks directory: {str(e)}")
 
-        for filename in os.listdir(TASKS_DIR):
-            if not filename.endswith('.txt'):
-                continue
+    return deleted_count
 
-            file_path = os.path.join(TASKS_DIR, filename)
 
-            try:
-                # Get file creation/modification time
-                file_mtime = os.path.getmtime(file_path)
-                file_age = current_time - file_mtime
-
-                if file_age > max_age_seconds:
-                    os.remove(file_path)
-                    deleted_count += 1
-                    logger.info(f"Deleted old task file: {filename} (age: {file_age:.0f}s)")
-            except OSError as e:
-                logger.warning(f"Error processing task file {filename}: {str(e)}")
-                continue
+@lru_cache(maxsize=1)
+def _encode_api_key(api_key):
+    """
+    Encode the configured API key once for constant-time comparison.
 
-    except OSError as e:
-        logger.error(f"Error accessing tasks directory: {str(e)}")
+    Args:
+        api_key: The configured API key
 
-    return deleted_count
+    Returns:
+        bytes: UTF-8 encoded API key
+    """
+    return api_key.encode('utf-8')
 
 
 def require_api_key(f):
@@ -309,7 +581,8 @@ def require_api_key(f):
                 'error': 'API key is required. Provide it via X-API-Key header or api_key query parameter.'
             }), 401
 
-        if provided_key != API_KEY:
+        # Constant-time comparison to avoid leaking the key through timing
+        if not hmac.compare_digest(provided_key.encode('utf-8'), _encode_api_key(API_KEY)):
             return jsonify({
                 'success': False,
                 'error': 'Invalid API key'
@@ -323,22 +596,15 @@ def get_client_ip():
     """
     Get the real client IP address from the request.
 
-    Handles cases where the API is behind a reverse proxy by checking
-    X-Forwarded-For and X-Real-IP headers first.
+    When the API is behind reverse proxies (TRUSTED_PROXY_HOPS > 0), ProxyFix
+    has already replaced the remote address with the client address from
+    X-Forwarded-For, using only the entries added by the trusted proxies.
+    Entries supplied by the client itself are ignored, so they cannot be used
+    to bypass rate limiting.
 
     Returns:
         str: Client IP address
     """
-    # Check X-Forwarded-For header (set by reverse proxies)
-    if request.headers.get('X-Forwarded-For'):
-        # X-Forwarded-For can contain multiple IPs, take the first one (original client)
-        return request.headers.get('X-Forwarded-For').split(',')[0].strip()
-
-    # Check X-Real-IP header (set by some reverse proxies like nginx)
-    if request.headers.get('X-Real-IP'):
-        return request.headers.get('X-Real-IP')
-
-    # Fall back to direct remote address
     return request.remote_addr
 
 
@@ -374,24 +640,379 @@ def check_rate_limit(f):
     return decorated_function
 
 
-def get_data_file_path(lang):
+def serialize_json(data):
     """
-    Get the path to the data file for the specified language.
-    Falls back to default language (ru) if the requested language file doesn't exist.
+    Serialize data to a JSON response body.
+
+    Uses orjson when it is installed, otherwise the standard json module.
+    Keys are sorted, as with jsonify(), and non-ASCII characters are written
+    as UTF-8 rather than \\uXXXX escapes, which keeps Cyrillic data compact.
+
+    Args:
+        data: JSON-serializable data
+
+    Returns:
+        bytes: UTF-8 encoded JSON body
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_SORT_KEYS | orjson.OPT_APPEND_NEWLINE)
+    body = json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return f"{body}\n".encode('utf-8')
+
+
+def encode_json_string(text):
+    """
+    Encode a string as a JSON string literal, the same way as serialize_json().
+
+    Args:
+        text: String to encode
+
+    Returns:
+        bytes: UTF-8 encoded JSON string including the quotes
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(text)
+    return json.dumps(text, ensure_ascii=False).encode('utf-8')
+
+
+def json_response(body, status=200):
+    """
+    Build a JSON response from an already serialized body.
+
+    Args:
+        body: Serialized JSON body (bytes)
+        status: HTTP status code (default: 200)
+
+    Returns:
+        Response: Flask response with application/json mimetype
+    """
+    return Response(body, status=status, mimetype='application/json')
+
+
+class OrjsonJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson, used by jsonify() and request.get_json().
+
+    Output matches serialize_json(): keys are sorted and non-ASCII characters
+    are written as UTF-8. Responses are built from the bytes produced by
+    orjson without an intermediate str.
+    """
+
+    def _options(self, indent=None):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self._options(kwargs.get('indent'))).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=self.default, option=self._options(indent) | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+if ORJSON_AVAILABLE:
+    app.json = OrjsonJSONProvider(app)
+
+
+@lru_cache(maxsize=16)
+def _resolve_data_file_path(data_dir, lang):
+    """
+    Resolve the data file path for a language in a data directory (memoized).
 
     Args:
+        data_dir: Directory with data files
         lang: Language code (e.g., 'ru', 'en')
 
     Returns:
         Path to the data file
     """
     # Try to get the data file for the requested language
-    data_file = os.path.join(DATA_DIR, f'data_{lang}.json')
+    data_file = os.path.join(data_dir, f'data_{lang}.json')
     if os.path.exists(data_file):
         return data_file
 
     # Fall back to default language
-    return os.path.join(DATA_DIR, f'data_{DEFAULT_LANG}.json')
+    return os.path.join(data_dir, f'data_{DEFAULT_LANG}.json')
+
+
+def get_data_file_path(lang):
+    """
+    Get the path to the data file for the specified language.
+    Falls back to default language (ru) if the requested language file doesn't exist.
+
+    The result is memoized per language, so the existence check is done
+    only once; adding a new language file requires restarting the API.
+
+    Args:
+        lang: Language code (e.g., 'ru', 'en')
+
+    Returns:
+        Path to the data file
+    """
+    return _resolve_data_file_path(DATA_DIR, lang)
+
+
+def _parse_json_file_mmap(file_path):
+    """
+    Parse a JSON file with orjson directly from a read-only memory mapping.
+
+    The mapping is passed to orjson as a memoryview, avoiding an intermediate
+    copy of the file contents and a separate UTF-8 decoding pass.
+
+    Args:
+        file_path: Path to the JSON file
+
+    Returns:
+        Parsed JSON data
+    """
+    with open(file_path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            return orjson.loads(f.read())
+
+        with mm:
+            view = memoryview(mm)
+            try:
+                return orjson.loads(view)
+            finally:
+                view.release()
+
+
+def _load_data_file(data_file_path):
+    """
+    Load a data file through the in-memory cache.
+
+    The parsed content is cached per file path and reused while the file's
+    modification time and size are unchanged, so repeated requests only
+    cost a single stat() call. Together with the list of scripts, an index
+    of scripts by script_name, the serialized (plain and gzip-compressed)
+    /api/scripts_list response body and the serialized
+    /api/script/<script_name> bodies are built once per load.
+
+    Args:
+        data_file_path: Path to the data file
+
+    Returns:
+        dict: Cache entry with etag, scripts, scripts_index, list_body,
+              list_body_gzip and script_bodies
+    """
+    stat_result = os.stat(data_file_path)
+    cached = _DATA_CACHE.get(data_file_path)
+    if _is_data_cache_fresh(cached, stat_result):
+        return cached
+
+    # Only one thread (re)loads a data file; others wait and reuse its result
+    with _DATA_CACHE_LOCK:
+        cached = _DATA_CACHE.get(data_file_path)
+        if _is_data_cache_fresh(cached, stat_result):
+            return cached
+
+        cached = _build_data_cache_entry(data_file_path, stat_result)
+        _DATA_CACHE[data_file_path] = cached
+        return cached
+
+
+def _is_data_cache_fresh(cached, stat_result):
+    """
+    Check whether a data file cache entry matches the file's current state.
+
+    Args:
+        cached: Cache entry or None
+        stat_result: os.stat() result of the data file
+
+    Returns:
+        bool: True if the entry can be used
+    """
+    return (
+        cached is not None
+        and cached['mtime_ns'] == stat_result.st_mtime_ns
+        and cached['size'] == stat_result.st_size
+    )
+
+
+def _build_data_cache_entry(data_file_path, stat_result):
+    """
+    Parse a data file and build its cache entry.
+
+    Args:
+        data_file_path: Path to the data file
+        stat_result: os.stat() result of the data file
+
+    Returns:
+        dict: Cache entry (see _load_data_file())
+    """
+    if ORJSON_AVAILABLE:
+        # orjson.JSONDecodeError is a subclass of json.JSONDecodeError
+        scripts = _parse_json_file_mmap(data_file_path)
+    else:
+        # A single read() of the raw bytes; json.loads detects UTF-8 itself
+        with open(data_file_path, 'rb') as f:
+            scripts = json.loads(f.read())
+
+    # Keep the first script for each name, matching the former linear search
+    scripts_index = {}
+    for script in scripts:
+        name = script.get('script_name')
+        if name is not None:
+            scripts_index.setdefault(name, script)
+
+    list_body = serialize_json({
+        'success': True,
+        'count': len(scripts),
+        'scripts': scripts
+    })
+
+    script_bodies = {
+        name: serialize_json({
+            'success': True,
+            'result': script
+        })
+        for name, script in scripts_index.items()
+    }
+
+    return {
+        'mtime_ns': stat_result.st_mtime_ns,
+        'size': stat_result.st_size,
+        'etag': f"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}",
+        'scripts': scripts,
+        'scripts_index': scripts_index,
+        'list_body': list_body,
+        'list_body_gzip': gzip.compress(list_body, compresslevel=6),
+        'script_bodies': script_bodies
+    }
+
+
+def load_scripts(data_file_path):
+    """
+    Load the list of scripts from a data file (cached until the file changes).
+
+    Args:
+        data_file_path: Path to the data file
+
+    Returns:
+        list: Scripts loaded from the data file
+    """
+    return _load_data_file(data_file_path)['scripts']
+
+
+def load_scripts_index(data_file_path):
+    """
+    Load the scripts from a data file indexed by script_name.
+
+    Args:
+        data_file_path: Path to the data file
+
+    Returns:
+        dict: Mapping of script_name to script details
+    """
+    return _load_data_file(data_file_path)['scripts_index']
+
+
+def _get_script_body(cached, script_name):
+    """
+    Get the serialized /api/script/<script_name> response body from a cache entry.
+
+    Args:
+        cached: Data file cache entry returned by _load_data_file()
+        script_name: The script_name to look up
+
+    Returns:
+        bytes: Serialized response body, or None if the script was not found
+    """
+    return cached['script_bodies'].get(script_name)
+
+
+def load_script_body(data_file_path, script_name):
+    """
+    Get the serialized /api/script/<script_name> response body for a script.
+
+    Args:
+        data_file_path: Path to the data file
+        script_name: The script_name to look up
+
+    Returns:
+        bytes: Serialized response body, or None if the script was not found
+    """
+    return _get_script_body(_load_data_file(data_file_path), script_name)
+
+
+def cached_json_response(body, cached, gzip_body=None):
+    """
+    Build a conditional JSON response for data served from the data file cache.
+
+    The response carries ETag and Last-Modified headers derived from the
+    data file, and is turned into a 304 Not Modified response when the
+    client already has the current version (If-None-Match/If-Modified-Since).
+    If a pre-compressed body is given and the client accepts gzip, it is
+    sent instead with Content-Encoding: gzip.
+
+    Args:
+        body: Serialized JSON body (bytes)
+        cached: Data file cache entry returned by _load_data_file()
+        gzip_body: Optional gzip-compressed version of body (bytes)
+
+    Returns:
+        Response: Flask response (200 with body, or 304 without body)
+    """
+    if gzip_body is not None and request.accept_encodings['gzip']:
+        response = json_response(gzip_body)
+        response.content_encoding = 'gzip'
+        response.set_etag(f"{cached['etag']}-gzip")
+    else:
+        response = json_response(body)
+        response.set_etag(cached['etag'])
+
+    if gzip_body is not None:
+        response.vary.add('Accept-Encoding')
+
+    response.last_modified = cached['mtime_ns'] / 1e9
+    response.cache_control.max_age = DATA_CACHE_MAX_AGE
+    return response.make_conditional(request)
+
+
+def warmup_data_cache():
+    """
+    Load all data files (data_*.json) in DATA_DIR into the in-memory cache.
+
+    Called at import time so that, when the app is served by gunicorn with
+    --preload, workers inherit the parsed data from the master process
+    instead of each loading it on its first request.
+
+    Returns:
+        int: Number of data files loaded
+    """
+    loaded_count = 0
+    try:
+        filenames = sorted(os.listdir(DATA_DIR))
+    except OSError as e:
+        logger.warning(f"Error accessing data directory: {str(e)}")
+        return 0
+
+    for filename in filenames:
+        if not (filename.startswith('data_') and filename.endswith('.json')):
+            continue
+        try:
+            _load_data_file(os.path.join(DATA_DIR, filename))
+            loaded_count += 1
+        except Exception as e:
+            logger.warning(f"Error preloading data file {filename}: {str(e)}")
+
+    return loaded_count
+
+
+if PRELOAD_DATA:
+    warmup_data_cache()
 
 
 @app.route('/api/scripts_list', methods=['GET'])
@@ -414,22 +1035,9 @@ def scripts_list():
         # Get the appropriate data file path
         data_file_path = get_data_file_path(lang)
 
-        if not os.path.exists(data_file_path):
-            return jsonify({
-                'success': False,
-                'error': 'Data file not found',
-                'scripts': []
-            }), 404
-
-        # Load scripts from the data file
-        with open(data_file_path, 'r', encoding='utf-8') as f:
-            scripts = json.load(f)
-
-        return jsonify({
-            'success': True,
-            'count': len(scripts),
-            'scripts': scripts
-        })
+        # Serve the pre-serialized scripts list (cached until the file changes)
+        cached = _load_data_file(data_file_path)
+        return cached_json_response(cached['list_body'], cached, cached['list_body_gzip'])
 
     except json.JSONDecodeError as e:
         return jsonify({
@@ -437,6 +1045,12 @@ def scripts_list():
             'error': f'Invalid JSON format in data file: {str(e)}',
             'scripts': []
         }), 500
+    except FileNotFoundError:
+        return jsonify({
+            'success': False,
+            'error': 'Data file not found',
+            'scripts': []
+        }), 404
     except PermissionError:
         return jsonify({
             'success': False,
@@ -451,73 +1065,464 @@ def scripts_list():
         }), 500
 
 
-@app.route('/api/script/<script_name>', methods=['GET'])
-@require_api_key
-def get_script(script_name):
+@app.route('/api/script/<script_name>', methods=['GET'])
+@require_api_key
+def get_script(script_name):
+    """
+    Get information about a single script by its script_name.
+
+    URL Parameters:
+        script_name: The script_name to look up (e.g., 'various-useful-api-django')
+
+    Query Parameters:
+        lang: Language code for the data file (default: 'ru')
+              Falls back to 'ru' if the requested language file doesn't exist.
+
+    Returns:
+        JSON response with script details if found, or 404 if not found.
+    """
+    try:
+        # Get language from query parameter, default to 'ru'
+        lang = request.args.get('lang', DEFAULT_LANG)
+
+        # Get the appropriate data file path
+        data_file_path = get_data_file_path(lang)
+
+        # Find the script by script_name (response is cached until the file changes)
+        cached = _load_data_file(data_file_path)
+        body = _get_script_body(cached, script_name)
+        if body is not None:
+            return cached_json_response(body, cached)
+
+        # Script not found
+        return jsonify({
+            'success': False,
+            'error': f'Script with script_name "{script_name}" not found',
+            'result': None
+        }), 404
+
+    except json.JSONDecodeError as e:
+        return jsonify({
+            'success': False,
+            'error': f'Invalid JSON format in data file: {str(e)}',
+            'result': None
+        }), 500
+    except FileNotFoundError:
+        return jsonify({
+            'success': False,
+            'error': 'Data file not found',
+            'result': None
+        }), 404
+    except PermissionError:
+        return jsonify({
+            'success': False,
+            'error': 'Permission denied accessing data file',
+            'result': None
+        }), 403
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'result': None
+        }), 500
+
+
+def connect_ssh(server_ip, server_root_password, port=SSH_DEFAULT_PORT):
+    """
+    Open an SSH connection to a remote server as root using password authentication.
+
+    All SSH connections are created here, so connection settings are kept
+    in one place for both the synchronous and the background execution paths.
+
+    Args:
+        server_ip: IP address of the remote server
+        server_root_password: Root password for SSH authentication
+        port: SSH port (default: 22)
+
+    Returns:
+        paramiko.SSHClient: Connected SSH client
+    """
+    ssh_client = paramiko.SSHClient()
+    ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    try:
+        ssh_client.connect(
+            hostname=server_ip,
+            port=port,
+            username='root',
+            password=server_root_password,
+            timeout=SSH_DEFAULT_TIMEOUT,
+            banner_timeout=SSH_BANNER_TIMEOUT,
+            auth_timeout=SSH_AUTH_TIMEOUT,
+            look_for_keys=False,
+            allow_agent=False
+        )
+    except Exception:
+        ssh_client.close()
+        raise
+
+    if SSH_KEEPALIVE_INTERVAL > 0:
+        transport = ssh_client.get_transport()
+        if transport is not None:
+            transport.set_keepalive(SSH_KEEPALIVE_INTERVAL)
+    return ssh_client
+
+
+def _ssh_pool_key(server_ip, server_root_password, port):
+    """
+    Build the SSH pool key for a server (the password is stored only as a hash).
+
+    Args:
+        server_ip: IP address of the remote server
+        server_root_password: Root password for SSH authentication
+        port: SSH port
+
+    Returns:
+        tuple: (server_ip, port, password_hash)
+    """
+    password_hash = hashlib.sha256(server_root_password.encode('utf-8')).hexdigest()
+    return server_ip, port, password_hash
+
+
+def _is_ssh_client_active(ssh_client):
+    """
+    Check whether an SSH client still has an active transport.
+
+    Args:
+        ssh_client: paramiko.SSHClient instance
+
+    Returns:
+        bool: True if the connection can be used
+    """
+    transport = ssh_client.get_transport()
+    return transport is not None and transport.is_active()
+
+
+def _prune_ssh_pool(now):
+    """
+    Remove expired idle connections from the pool (must be called with the pool lock held).
+
+    Args:
+        now: Current time (time.time())
+
+    Returns:
+        list: Removed SSH clients, to be closed by the caller outside the lock
+    """
+    expired = []
+    for key in list(_ssh_pool):
+        idle = []
+        for ssh_client, released_at in _ssh_pool[key]:
+            if now - released_at > SSH_POOL_IDLE_TIMEOUT:
+                expired.append(ssh_client)
+            else:
+                idle.append((ssh_client, released_at))
+        if idle:
+            _ssh_pool[key] = idle
+        else:
+            del _ssh_pool[key]
+    return expired
+
+
+def acquire_ssh_client(server_ip, server_root_password, port=SSH_DEFAULT_PORT):
+    """
+    Get a connected SSH client, reusing an idle pooled connection when possible.
+
+    Args:
+        server_ip: IP address of the remote server
+        server_root_password: Root password for SSH authentication
+        port: SSH port (default: 22)
+
+    Returns:
+        paramiko.SSHClient: Connected SSH client
+    """
+    key = _ssh_pool_key(server_ip, server_root_password, port)
+    reused = None
+
+    with _ssh_pool_lock:
+        stale = _prune_ssh_pool(time.time())
+        idle = _ssh_pool.get(key, [])
+        while idle:
+            ssh_client, _ = idle.pop()
+            if _is_ssh_client_active(ssh_client):
+                reused = ssh_client
+                break
+            stale.append(ssh_client)
+
+    for ssh_client in stale:
+        ssh_client.close()
+
+    if reused is not None:
+        logger.info(f"Reusing SSH connection to {server_ip}:{port}")
+        return reused
+
+    return connect_ssh(server_ip, server_root_password, port)
+
+
+def release_ssh_client(ssh_client, server_ip, server_root_password, port=SSH_DEFAULT_PORT, reusable=True):
+    """
+    Return an SSH client to the pool, or close it.
+
+    The client is closed instead of pooled when pooling is disabled, the
+    connection is not reusable (e.g. after an error) or the pool for the
+    server is full.
+
+    Args:
+        ssh_client: paramiko.SSHClient instance
+        server_ip: IP address of the remote server
+        server_root_password: Root password for SSH authentication
+        port: SSH port (default: 22)
+        reusable: Whether the connection is in a clean state for reuse
+    """
+    if not reusable or SSH_POOL_IDLE_TIMEOUT <= 0 or not _is_ssh_client_active(ssh_client):
+        ssh_client.close()
+        return
+
+    key = _ssh_pool_key(server_ip, server_root_password, port)
+    now = time.time()
+    pooled = False
+
+    with _ssh_pool_lock:
+        stale = _prune_ssh_pool(now)
+        idle = _ssh_pool.setdefault(key, [])
+        if len(idle) < SSH_POOL_MAX_IDLE:
+            idle.append((ssh_client, now))
+            pooled = True
+
+    for stale_client in stale:
+        stale_client.close()
+
+    if not pooled:
+        ssh_client.close()
+
+
+def close_ssh_pool():
+    """
+    Close all idle pooled SSH connections.
+    """
+    with _ssh_pool_lock:
+        clients = [ssh_client for idle in _ssh_pool.values() for ssh_client, _ in idle]
+        _ssh_pool.clear()
+
+    for ssh_client in clients:
+        ssh_client.close()
+
+
+# Idle pooled connections are otherwise only pruned when the pool is used,
+# so close them explicitly when the worker process exits
+atexit.register(close_ssh_pool)
+
+
+class BoundedOutputBuffer:
+    """
+    Byte buffer that keeps only the last max_bytes of the data appended to it.
+
+    Used to collect script output with bounded memory: when the buffer grows
+    beyond max_bytes, the oldest data is dropped. The content is decoded once
+    when it is retrieved.
+    """
+
+    def __init__(self, max_bytes=None):
+        """
+        Initialize the buffer.
+
+        Args:
+            max_bytes: Maximum number of bytes to keep (default: SSH_MAX_OUTPUT_BYTES)
+        """
+        self.max_bytes = SSH_MAX_OUTPUT_BYTES if max_bytes is None else max_bytes
+        self.truncated = False
+        self._buffer = bytearray()
+
+    def append(self, data):
+        """
+        Append data, dropping the oldest bytes beyond max_bytes.
+
+        Args:
+            data: Bytes to append
+        """
+        self._buffer += data
+        if len(self._buffer) > self.max_bytes:
+            del self._buffer[:len(self._buffer) - self.max_bytes]
+            self.truncated = True
+
+    def getvalue(self):
+        """
+        Get the decoded content of the buffer.
+
+        Returns:
+            str: Decoded output (prefixed with a marker if truncated)
+        """
+        output = self._buffer.decode('utf-8', errors='replace')
+        if self.truncated:
+            output = '[... output truncated ...]\n' + output
+        return output
+
+
+def drain_channel(channel, on_stdout, on_stderr):
+    """
+    Read stdout and stderr of an SSH channel until the remote command finishes.
+
+    Both streams are drained in the same loop, waiting on the channel with
+    select() when no data is available, so a command writing a lot to one
+    stream never blocks on a full SSH window of the other.
+
+    Args:
+        channel: paramiko.Channel the command was executed on
+        on_stdout: Callable receiving each stdout chunk (bytes)
+        on_stderr: Callable receiving each stderr chunk (bytes)
+    """
+    while True:
+        while channel.recv_ready():
+            on_stdout(channel.recv(SSH_READ_CHUNK_SIZE))
+        while channel.recv_stderr_ready():
+            on_stderr(channel.recv_stderr(SSH_READ_CHUNK_SIZE))
+
+        # Wait for EOF rather than the exit status: the exit status message
+        # can arrive before the last chunks of output
+        finished = channel.eof_received or channel.closed
+        if finished and not channel.recv_ready() and not channel.recv_stderr_ready():
+            break
+
+        select.select([channel], [], [], 1.0)
+
+
+def _discard_output(chunk):
+    """Ignore a chunk of script output (used when there is no report to write it to)."""
+
+
+class TaskReportStream:
     """
-    Get information about a single script by its script_name.
+    Writes raw script output chunks to an open task report file.
 
-    URL Parameters:
-        script_name: The script_name to look up (e.g., 'various-useful-api-django')
+    Output is cleaned and written as bytes, without a decode/encode round
+    trip per chunk (the report is decoded when it is read). An ANSI escape
+    sequence cut off at the end of a chunk is held back until the rest of it
+    arrives, so it is stripped as a whole. Each chunk is flushed so
+    /api/status shows progress.
+    """
 
-    Query Parameters:
-        lang: Language code for the data file (default: 'ru')
-              Falls back to 'ru' if the requested language file doesn't exist.
+    # Longest escape sequence that is held back when incomplete
+    MAX_ESCAPE_LENGTH = 32
+
+    def __init__(self, report_file):
+        """
+        Initialize the stream.
+
+        Args:
+            report_file: Task report file opened for appending in binary mode
+        """
+        self._report_file = report_file
+        self._pending = b''
+
+    def write(self, data):
+        """
+        Write a chunk of output to the report.
+
+        Args:
+            data: Bytes received from the SSH channel
+        """
+        if self._pending:
+            data = self._pending + data
+        split = len(data)
+        escape = data.rfind(b'\x1b', max(0, split - self.MAX_ESCAPE_LENGTH))
+        if escape != -1 and not _ANSI_ESCAPE_RE_B.match(data, escape):
+            split = escape
+        self._pending = data[split:]
+        self._write(data[:split])
+
+    def flush(self):
+        """
+        Write any held-back output (call once the command has finished).
+        """
+        data = self._pending
+        self._pending = b''
+        self._write(data)
+
+    def _write(self, data):
+        if data:
+            self._report_file.write(strip_ansi_bytes(data))
+            self._report_file.flush()
+
+
+def load_local_script(script_name):
+    """
+    Read an installation script from SCRIPTS_DIR.
+
+    The content and its SHA-256 digest are cached in memory and re-read
+    only when the file's modification time or size changes. The digest is
+    recorded in the logs and the task report so it is always known exactly
+    which revision of a script was executed on a server.
+
+    Args:
+        script_name: Name of the script (without .sh extension)
 
     Returns:
-        JSON response with script details if found, or 404 if not found.
+        tuple: (script content as bytes, SHA-256 hex digest), or
+        (None, None) if the script does not exist locally
     """
+    script_path = os.path.join(SCRIPTS_DIR, f"{script_name}.sh")
     try:
-        # Get language from query parameter, default to 'ru'
-        lang = request.args.get('lang', DEFAULT_LANG)
+        stat_result = os.stat(script_path)
+    except FileNotFoundError:
+        return None, None
 
-        # Get the appropriate data file path
-        data_file_path = get_data_file_path(lang)
+    cached = _SCRIPT_FILE_CACHE.get(script_path)
+    if cached is not None and cached[0] == stat_result.st_mtime_ns and cached[1] == stat_result.st_size:
+        return cached[2], cached[3]
 
-        if not os.path.exists(data_file_path):
-            return jsonify({
-                'success': False,
-                'error': 'Data file not found',
-                'result': None
-            }), 404
+    with open(script_path, 'rb') as f:
+        script_body = f.read()
+    script_sha256 = hashlib.sha256(script_body).hexdigest()
 
-        # Load scripts from the data file
-        with open(data_file_path, 'r', encoding='utf-8') as f:
-            scripts = json.load(f)
+    with _SCRIPT_FILE_CACHE_LOCK:
+        _SCRIPT_FILE_CACHE[script_path] = (
+            stat_result.st_mtime_ns, stat_result.st_size, script_body, script_sha256
+        )
+    return script_body, script_sha256
 
-        # Find the script by script_name
-        for script in scripts:
-            if script.get('script_name') == script_name:
-                return jsonify({
-                    'success': True,
-                    'result': script
-                })
 
-        # Script not found
-        return jsonify({
-            'success': False,
-            'error': f'Script with script_name "{script_name}" not found',
-            'result': None
-        }), 404
+def build_install_command(script_name, additional=None, from_stdin=False):
+    """
+    Build the shell command that downloads and executes an installation script.
 
-    except json.JSONDecodeError as e:
-        return jsonify({
-            'success': False,
-            'error': f'Invalid JSON format in data file: {str(e)}',
-            'result': None
-        }), 500
-    except PermissionError:
-        return jsonify({
-            'success': False,
-            'error': 'Permission denied accessing data file',
-            'result': None
-        }), 403
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'result': None
-        }), 500
+    The script is piped directly to bash without saving to disk. With
+    from_stdin, bash reads the script from the command's stdin instead
+    (see send_script()), and nothing is downloaded on the remote server.
+
+    Args:
+        script_name: Name of the script to execute (without .sh extension)
+        additional: Optional additional parameters to pass to the script
+        from_stdin: Whether the script is sent over the command's stdin
+
+    Returns:
+        str: Command to execute on the remote server
+    """
+    if from_stdin:
+        command = "bash -s"
+    else:
+        script_url = shlex.quote(f"{SCRIPTS_BASE_URL}/{script_name}.sh")
+        command = f"curl -fsSL -o- {script_url} | bash"
+
+    if additional:
+        # Escape and format the additional parameter(s)
+        # If the value contains spaces, it is split into multiple arguments
+        escaped_args = escape_shell_args(additional)
+        if from_stdin:
+            return f"{command} -- {escaped_args}"
+        return f"{command} -s -- {escaped_args}"
+
+    return command
+
+
+def send_script(stdin, script_body):
+    """
+    Send a script to a command started with build_install_command(..., from_stdin=True).
+
+    Args:
+        stdin: stdin file of the executed command
+        script_body: Script content (bytes)
+    """
+    stdin.write(script_body)
+    stdin.flush()
+    stdin.channel.shutdown_write()
 
 
 def execute_script_via_ssh(server_ip, server_root_password, script_name, additional=None, port=SSH_DEFAULT_PORT):
@@ -542,47 +1547,36 @@ def execute_script_via_ssh(server_ip, server_root_password, script_name, additio
         return False, '', 'SSH library (paramiko) is not installed'
 
     ssh_client = None
+    reusable = False
     try:
-        # Create SSH client
-        ssh_client = paramiko.SSHClient()
-        ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-
         logger.info(f"Connecting to {server_ip}:{port} via SSH...")
 
-        # Connect to the server
-        ssh_client.connect(
-            hostname=server_ip,
-            port=port,
-            username='root',
-            password=server_root_password,
-            timeout=SSH_DEFAULT_TIMEOUT,
-            look_for_keys=False,
-            allow_agent=False
-        )
+        # Connect to the server (or reuse a pooled connection)
+        ssh_client = acquire_ssh_client(server_ip, server_root_password, port)
 
         # Build the command to download and execute the script
-        # The script is piped directly to bash without saving to disk
-        script_url = f"{SCRIPTS_BASE_URL}/{script_name}.sh"
-
-        if additional:
-            # Escape and format the additional parameter(s)
-            # If the value contains spaces, it is split into multiple arguments
-            escaped_args = escape_shell_args(additional)
-            command = f"curl -fsSL -o- {script_url} | bash -s -- {escaped_args}"
-        else:
-            command = f"curl -fsSL -o- {script_url} | bash"
+        script_body, script_sha256 = load_local_script(script_name) if SCRIPTS_UPLOAD else (None, None)
+        command = build_install_command(script_name, additional, from_stdin=script_body is not None)
 
         logger.info(f"Executing command: {command}")
+        if script_sha256:
+            logger.info(f"Uploading local script {script_name}.sh (sha256: {script_sha256})")
 
-        # Execute the command
-        stdin, stdout, stderr = ssh_client.exec_command(command, get_pty=True)
+        # Execute the command (without a PTY, so stderr is delivered separately)
+        stdin, stdout, stderr = ssh_client.exec_command(command)
+        if script_body is not None:
+            send_script(stdin, script_body)
 
-        # Read output
-        output = stdout.read().decode('utf-8', errors='replace')
-        error_output = stderr.read().decode('utf-8', errors='replace')
+        # Read output (bounded to the last SSH_MAX_OUTPUT_BYTES of each stream)
+        output_buffer = BoundedOutputBuffer()
+        error_buffer = BoundedOutputBuffer()
+        drain_channel(stdout.channel, output_buffer.append, error_buffer.append)
+        output = output_buffer.getvalue()
+        error_output = error_buffer.getvalue()
 
         # Get exit status
         exit_status = stdout.channel.recv_exit_status()
+        reusable = True
 
         # Combine output
         full_output = output
@@ -604,7 +1598,7 @@ def execute_script_via_ssh(server_ip, server_root_password, script_name, additio
         return False, '', f'Unexpected error: {str(e)}'
     finally:
         if ssh_client:
-            ssh_client.close()
+            release_ssh_client(ssh_client, server_ip, server_root_password, port, reusable)
 
 
 def execute_script_via_ssh_async(task_id, server_ip, server_root_password, script_name, additional=None, port=SSH_DEFAULT_PORT):
@@ -627,94 +1621,76 @@ def execute_script_via_ssh_async(task_id, server_ip, server_root_password, scrip
         return
 
     ssh_client = None
+    reusable = False
     try:
-        # Create SSH client
-        ssh_client = paramiko.SSHClient()
-        ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-
         logger.info(f"[Task {task_id}] Connecting to {server_ip}:{port} via SSH...")
         append_task_content(task_id, f"Connecting to {server_ip}:{port} via SSH...\n")
 
-        # Connect to the server
-        ssh_client.connect(
-            hostname=server_ip,
-            port=port,
-            username='root',
-            password=server_root_password,
-            timeout=SSH_DEFAULT_TIMEOUT,
-            look_for_keys=False,
-            allow_agent=False
-        )
+        # Connect to the server (or reuse a pooled connection)
+        ssh_client = acquire_ssh_client(server_ip, server_root_password, port)
 
         # Build the command to download and execute the script
-        script_url = f"{SCRIPTS_BASE_URL}/{script_name}.sh"
-
-        if additional:
-            # Escape and format the additional parameter(s)
-            # If the value contains spaces, it is split into multiple arguments
-            escaped_args = escape_shell_args(additional)
-            command = f"curl -fsSL -o- {script_url} | bash -s -- {escaped_args}"
-        else:
-            command = f"curl -fsSL -o- {script_url} | bash"
+        script_body, script_sha256 = load_local_script(script_name) if SCRIPTS_UPLOAD else (None, None)
+        command = build_install_command(script_name, additional, from_stdin=script_body is not None)
 
         logger.info(f"[Task {task_id}] Executing command: {command}")
-        append_task_content(task_id, f"Executing script: {script_name}\n")
-
-        # Execute the command
-        stdin, stdout, stderr = ssh_client.exec_command(command, get_pty=True)
-
-        # Stream output to the task file
-        output_buffer = []
-        while True:
-            line = stdout.readline()
-            if not line:
-                break
-            decoded_line = line if isinstance(line, str) else line.decode('utf-8', errors='replace')
-            output_buffer.append(decoded_line)
-            append_task_content(task_id, decoded_line)
-
-        # Read any remaining stderr
-        error_output = stderr.read().decode('utf-8', errors='replace')
-        if error_output:
-            append_task_content(task_id, f"\n{error_output}")
+        if script_sha256:
+            logger.info(f"[Task {task_id}] Uploading local script {script_name}.sh (sha256: {script_sha256})")
+            append_task_content(task_id, f"Executing script: {script_name} (sha256: {script_sha256})\n")
+        else:
+            append_task_content(task_id, f"Executing script: {script_name}\n")
+
+        # Execute the command (without a PTY; stderr is merged into stdout
+        # by paramiko so both streams are written to the report in order)
+        stdin, stdout, stderr = ssh_client.exec_command(command)
+        stdout.channel.set_combine_stderr(True)
+        if script_body is not None:
+            send_script(stdin, script_body)
+
+        # Stream output to the task file in SSH_READ_CHUNK_SIZE chunks (the
+        # report file is the only copy of the output; nothing is accumulated
+        # in memory). The file is opened once for the whole execution, and
+        # without 'a' mode so a removed report is not recreated without the
+        # status line that finish_task() overwrites in place.
+        try:
+            report_file = open(get_task_file_path(task_id), 'r+b')
+        except FileNotFoundError:
+            logger.warning(f"[Task {task_id}] Task report was removed, discarding script output")
+            drain_channel(stdout.channel, _discard_output, _discard_output)
+        else:
+            with report_file:
+                report_file.seek(0, os.SEEK_END)
+                report = TaskReportStream(report_file)
+                drain_channel(stdout.channel, report.write, report.write)
+                report.flush()
 
         # Get exit status
         exit_status = stdout.channel.recv_exit_status()
+        reusable = True
 
-        # Read current content and update status
-        _, current_content = read_task_status(task_id)
-
+        # Update status (the content written so far is kept as is)
         if exit_status != 0:
-            error_msg = f'\nScript exited with status {exit_status}'
-            write_task_status(task_id, TASK_STATUS_ERROR, (current_content or '') + error_msg)
+            finish_task(task_id, TASK_STATUS_ERROR, f'\nScript exited with status {exit_status}')
             logger.warning(f"[Task {task_id}] Installation failed with exit status {exit_status}")
         else:
-            write_task_status(task_id, TASK_STATUS_COMPLETED, current_content or '')
+            finish_task(task_id, TASK_STATUS_COMPLETED)
             logger.info(f"[Task {task_id}] Installation completed successfully")
 
     except paramiko.AuthenticationException:
-        _, current_content = read_task_status(task_id)
-        error_msg = '\nSSH authentication failed. Please check the password.'
-        write_task_status(task_id, TASK_STATUS_ERROR, (current_content or '') + error_msg)
+        finish_task(task_id, TASK_STATUS_ERROR, '\nSSH authentication failed. Please check the password.')
         logger.error(f"[Task {task_id}] SSH authentication failed")
     except paramiko.SSHException as e:
-        _, current_content = read_task_status(task_id)
-        error_msg = f'\nSSH connection error: {str(e)}'
-        write_task_status(task_id, TASK_STATUS_ERROR, (current_content or '') + error_msg)
+        finish_task(task_id, TASK_STATUS_ERROR, f'\nSSH connection error: {str(e)}')
         logger.error(f"[Task {task_id}] SSH connection error: {str(e)}")
     except TimeoutError:
-        _, current_content = read_task_status(task_id)
-        error_msg = f'\nConnection to {server_ip} timed out'
-        write_task_status(task_id, TASK_STATUS_ERROR, (current_content or '') + error_msg)
+        finish_task(task_id, TASK_STATUS_ERROR, f'\nConnection to {server_ip} timed out')
         logger.error(f"[Task {task_id}] Connection timed out")
     except Exception as e:
-        _, current_content = read_task_status(task_id)
-        error_msg = f'\nUnexpected error: {str(e)}'
-        write_task_status(task_id, TASK_STATUS_ERROR, (current_content or '') + error_msg)
+        finish_task(task_id, TASK_STATUS_ERROR, f'\nUnexpected error: {str(e)}')
         logger.error(f"[Task {task_id}] Unexpected error: {str(e)}")
     finally:
         if ssh_client:
-            ssh_client.close()
+            release_ssh_client(ssh_client, server_ip, server_root_password, port, reusable)
 
 
 @app.route('/api/install', methods=['POST'])
@@ -722,7 +1698,10 @@ def execute_script_via_ssh_async(task_id, server_ip, server_root_password, scrip
 @check_rate_limit
 def install():
     """
-    Start an installation script on a remote server via SSH in a background thread.
+    Start an installation script on a remote server via SSH in the background.
+
+    The installation is submitted to a bounded thread pool (INSTALL_WORKERS)
+    and the request returns immediately; use /api/status/<task_id> to poll it.
 
     Requires API key authentication if API_KEY is set in environment.
 
@@ -762,9 +1741,15 @@ def install():
                 'task_id': None
             }), 400
 
+        if not isinstance(data, dict):
+            return jsonify({
+                'success': False,
+                'error': 'Request body must be a JSON object',
+                'task_id': None
+            }), 400
+
         # Validate required fields
-        required_fields = ['script_name', 'server_ip', 'server_root_password']
-        missing_fields = [field for field in required_fields if not data.get(field)]
+        missing_fields = [field for field in _REQUIRED_INSTALL_FIELDS if not data.get(field)]
 
         if missing_fields:
             return jsonify({
@@ -773,22 +1758,33 @@ def install():
                 'task_id': None
             }), 400
 
+        # Validate field types (null is accepted for the optional additional field)
+        invalid_fields = [field for field in _REQUIRED_INSTALL_FIELDS if not isinstance(data[field], str)]
+        if data.get('additional') is not None and not isinstance(data['additional'], str):
+            invalid_fields.append('additional')
+
+        if invalid_fields:
+            return jsonify({
+                'success': False,
+                'error': f'Fields must be strings: {", ".join(invalid_fields)}',
+                'task_id': None
+            }), 400
+
         script_name = data['script_name']
         server_ip = data['server_ip']
         server_root_password = data['server_root_password']
         additional = data.get('additional', '')
 
         # Validate script_name format (basic security check)
-        if not script_name.replace('-', '').replace('_', '').isalnum():
+        if not _SCRIPT_NAME_RE.fullmatch(script_name):
             return jsonify({
                 'success': False,
                 'error': 'Invalid script_name format. Only alphanumeric characters, hyphens, and underscores are allowed.',
                 'task_id': None
             }), 400
 
-        # Validate server_ip format (basic check)
-        ip_pattern = re.compile(r'^(\d{1,3}\.){3}\d{1,3}$')
-        if not ip_pattern.match(server_ip):
+        # Validate server_ip format
+        if not is_valid_ipv4(server_ip):
             return jsonify({
                 'success': False,
                 'error': 'Invalid server_ip format. Please provide a valid IPv4 address.',
@@ -807,17 +1803,32 @@ def install():
                 'message': 'Task already in progress'
             })
 
-        # Create task file with initial processing status
-        write_task_status(task_id, TASK_STATUS_PROCESSING, f"Starting installation of '{script_name}' on {server_ip}...\n")
-
-        # Start the installation in a background thread
-        logger.info(f"Starting installation task {task_id} for '{script_name}' on {server_ip}")
-        thread = threading.Thread(
-            target=execute_script_via_ssh_async,
-            args=(task_id, server_ip, server_root_password, script_name, additional),
-            daemon=True
-        )
-        thread.start()
+        # Reserve a slot in the executor (running or queued), or reject when the queue is full
+        # (the semaphore is bound locally so the same one is released when the task finishes)
+        slots = _install_slots
+        if not slots.acquire(blocking=False):
+            logger.warning(f"Installation queue is full, rejecting task {task_id}")
+            return jsonify({
+                'success': False,
+                'error': 'Server is busy. Too many installations are in progress, please try again later.',
+                'task_id': None
+            }), 503
+
+        # Release the slot if the task cannot be started (e.g. the task file cannot be written)
+        try:
+            # Create task file with initial processing status
+            write_task_status(task_id, TASK_STATUS_PROCESSING, f"Starting installation of '{script_name}' on {server_ip}...\n")
+
+            # Start the installation in the background executor
+            logger.info(f"Starting installation task {task_id} for '{script_name}' on {server_ip}")
+            future = install_executor.submit(
+                execute_script_via_ssh_async,
+                task_id, server_ip, server_root_password, script_name, additional
+            )
+        except Exception:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: slots.release())
 
         return jsonify({
             'success': True,
@@ -825,6 +1836,9 @@ def install():
             'message': 'Installation started'
         })
 
+    except HTTPException:
+        # Let HTTP errors (e.g. 413 for oversized bodies) reach their error handlers
+        raise
     except Exception as e:
         logger.error(f"Unexpected error in /api/install: {str(e)}")
         return jsonify({
@@ -834,6 +1848,33 @@ def install():
         }), 500
 
 
+def _stream_task_status(status, report_file):
+    """
+    Generate the /api/status response body from an open task report file.
+
+    The content is read and JSON-encoded in chunks, so long reports are never
+    held in memory as a whole. The body is the same as jsonify() of
+    {'success': True, 'status': status, 'result': content}. The file is
+    closed by the response (see get_task_status), not by the generator.
+
+    Args:
+        status: Task status read from the report
+        report_file: Report file positioned at the start of the content
+
+    Yields:
+        bytes: Parts of the JSON response body
+    """
+    yield b'{"result":"'
+    while True:
+        chunk = report_file.read(SSH_READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        # Strip any remaining ANSI escape codes from content
+        # (content should already be clean, but this ensures backward compatibility)
+        yield encode_json_string(strip_ansi_codes(chunk))[1:-1]
+    yield b'","status":' + encode_json_string(status) + b',"success":true}\n'
+
+
 @app.route('/api/status/<task_id>', methods=['GET'])
 @require_api_key
 def get_task_status(task_id):
@@ -857,8 +1898,8 @@ def get_task_status(task_id):
         and subsequent requests for the same task_id will return "Task not found".
     """
     try:
-        # Validate task_id format (should be MD5 hash - 32 hex characters)
-        if not task_id or not re.match(r'^[a-f0-9]{32}$', task_id):
+        # Validate task_id format (should be a hash - 32 hex characters)
+        if not task_id or not _TASK_ID_RE.fullmatch(task_id):
             return jsonify({
                 'success': False,
                 'error': 'Invalid task_id format',
@@ -866,8 +1907,8 @@ def get_task_status(task_id):
                 'result': None
             }), 400
 
-        # Read task status and content
-        status, content = read_task_status(task_id)
+        # Read only the task status; the content is streamed from the file
+        status, report_file = open_task_report(task_id)
 
         if status is None:
             return jsonify({
@@ -877,21 +1918,23 @@ def get_task_status(task_id):
                 'result': None
             }), 404
 
-        # Strip any remaining ANSI escape codes from content
-        # (content should already be clean, but this ensures backward compatibility)
-        clean_content = strip_ansi_codes(content) if content else content
-
-        response = {
-            'success': True,
-            'status': status,
-            'result': clean_content
-        }
-
-        # If task is completed or has an error, delete the file after returning
+        # If task is completed or has an error, delete the file now; the
+        # open handle still reads its content (on platforms where an open
+        # file cannot be removed, it is deleted once it has been sent)
+        delete_after_send = False
         if status in (TASK_STATUS_COMPLETED, TASK_STATUS_ERROR):
-            delete_task_file(task_id)
-
-        return jsonify(response)
+            try:
+                delete_task_file(task_id)
+            except OSError:
+                delete_after_send = True
+
+        # The report is closed when the response is closed, which also happens
+        # if the body is never iterated (client gone, HEAD request)
+        response = Response(_stream_task_status(status, report_file), mimetype='application/json')
+        response.call_on_close(report_file.close)
+        if delete_after_send:
+            response.call_on_close(lambda: delete_task_file(task_id))
+        return response
 
     except Exception as e:
         logger.error(f"Unexpected error in /api/status/{task_id}: {str(e)}")
@@ -903,6 +1946,25 @@ def get_task_status(task_id):
         }), 500
 
 
+# Pre-serialized responses of the protection endpoints when protection is disabled
+_PROTECTION_DISABLED_BODY = serialize_json({
+    'success': False,
+    'error': 'Protection mode is disabled'
+})
+
+_BLOCKED_IPS_DISABLED_BODY = serialize_json({
+    'success': False,
+    'error': 'Protection mode is disabled',
+    'blocked_ips': []
+})
+
+_REQUEST_STATS_DISABLED_BODY = serialize_json({
+    'success': False,
+    'error': 'Protection mode is disabled',
+    'stats': []
+})
+
+
 @app.route('/api/protection/status', methods=['GET'])
 @require_api_key
 def protection_status():
@@ -937,11 +1999,7 @@ def get_blocked_ips():
         JSON response with list of blocked IPs and their details.
     """
     if not rate_limiter.enabled:
-        return jsonify({
-            'success': False,
-            'error': 'Protection mode is disabled',
-            'blocked_ips': []
-        })
+        return json_response(_BLOCKED_IPS_DISABLED_BODY)
 
     blocked = rate_limiter.get_blocked_ips()
     return jsonify({
@@ -969,10 +2027,7 @@ def block_ip():
         JSON response indicating success or failure.
     """
     if not rate_limiter.enabled:
-        return jsonify({
-            'success': False,
-            'error': 'Protection mode is disabled'
-        }), 400
+        return json_response(_PROTECTION_DISABLED_BODY, 400)
 
     data = request.get_json(silent=True)
 
@@ -991,8 +2046,7 @@ def block_ip():
         }), 400
 
     # Validate IP format
-    ip_pattern = re.compile(r'^(\d{1,3}\.){3}\d{1,3}$')
-    if not ip_pattern.match(ip_address):
+    if not is_valid_ipv4(ip_address):
         return jsonify({
             'success': False,
             'error': 'Invalid IP address format'
@@ -1036,10 +2090,7 @@ def unblock_ip():
         JSON response indicating success or failure.
     """
     if not rate_limiter.enabled:
-        return jsonify({
-            'success': False,
-            'error': 'Protection mode is disabled'
-        }), 400
+        return json_response(_PROTECTION_DISABLED_BODY, 400)
 
     data = request.get_json(silent=True)
 
@@ -1057,6 +2108,13 @@ def unblock_ip():
             'error': 'Missing required field: ip'
         }), 400
 
+    # Validate IP format (only valid addresses can have been blocked)
+    if not is_valid_ipv4(ip_address):
+        return jsonify({
+            'success': False,
+            'error': 'Invalid IP address format'
+        }), 400
+
     success = rate_limiter.unblock_ip(ip_address)
 
     if success:
@@ -1071,6 +2129,172 @@ def unblock_ip():
         }), 404
 
 
+def _parse_bulk_ips(data):
+    """
+    Read and validate the list of IP addresses of a bulk block/unblock request.
+
+    Args:
+        data: Parsed JSON request body (or None)
+
+    Returns:
+        tuple: (valid_ips, invalid_ips, error_response); valid_ips has
+        duplicates removed, and error_response is set if the request
+        must be rejected
+    """
+    if data is None:
+        return None, None, (jsonify({
+            'success': False,
+            'error': 'Request body must be JSON'
+        }), 400)
+
+    if not isinstance(data, dict):
+        return None, None, (jsonify({
+            'success': False,
+            'error': 'Request body must be a JSON object'
+        }), 400)
+
+    ip_addresses = data.get('ips')
+
+    if not ip_addresses or not isinstance(ip_addresses, list):
+        return None, None, (jsonify({
+            'success': False,
+            'error': 'Missing required field: ips (a list of IP addresses)'
+        }), 400)
+
+    if len(ip_addresses) > BULK_BLOCK_MAX_IPS:
+        return None, None, (jsonify({
+            'success': False,
+            'error': f'Too many IP addresses (maximum {BULK_BLOCK_MAX_IPS})'
+        }), 400)
+
+    valid_ips = []
+    invalid_ips = []
+    for ip_address in ip_addresses:
+        (valid_ips if is_valid_ipv4(ip_address) else invalid_ips).append(ip_address)
+
+    if not valid_ips:
+        return None, None, (jsonify({
+            'success': False,
+            'error': 'No valid IP addresses',
+            'invalid': invalid_ips
+        }), 400)
+
+    return list(dict.fromkeys(valid_ips)), invalid_ips, None
+
+
+def _parse_block_options(data):
+    """
+    Read and validate the optional block settings of a bulk block request.
+
+    Args:
+        data: Parsed JSON request body (a dict)
+
+    Returns:
+        tuple: (reason, permanent, duration_hours, error_response);
+        error_response is set if the request must be rejected
+    """
+    reason = data.get('reason', 'Manual block')
+    permanent = data.get('permanent', False)
+    duration_hours = data.get('duration_hours', 1)
+
+    if not isinstance(reason, str):
+        error = 'Invalid reason: must be a string'
+    elif not isinstance(permanent, bool):
+        error = 'Invalid permanent: must be true or false'
+    # bool is a subclass of int, so true/false are rejected explicitly
+    elif (isinstance(duration_hours, bool) or not isinstance(duration_hours, (int, float))
+          or not 0 < duration_hours <= MAX_BLOCK_DURATION_HOURS):
+        error = f'Invalid duration_hours: must be a positive number of at most {MAX_BLOCK_DURATION_HOURS}'
+    else:
+        return reason, permanent, duration_hours, None
+
+    return None, None, None, (jsonify({
+        'success': False,
+        'error': error
+    }), 400)
+
+
+@app.route('/api/protection/block_bulk', methods=['POST'])
+@require_api_key
+def block_ips_bulk():
+    """
+    Block a list of IP addresses in one request.
+
+    All valid addresses are blocked in a single database transaction;
+    invalid addresses are skipped and returned in the response.
+
+    Requires API key authentication if API_KEY is set in environment.
+
+    POST Parameters (JSON body):
+        ips: List of IP addresses to block (required, at most BULK_BLOCK_MAX_IPS)
+        reason: Reason for blocking (optional)
+        permanent: Whether to block permanently (optional, default: false)
+        duration_hours: Duration of block in hours (optional, default: 1,
+                        at most MAX_BLOCK_DURATION_HOURS)
+
+    Returns:
+        JSON response with the number of blocked and the list of invalid addresses.
+    """
+    if not rate_limiter.enabled:
+        return json_response(_PROTECTION_DISABLED_BODY, 400)
+
+    # Allow a body large enough for BULK_BLOCK_MAX_IPS addresses
+    request.max_content_length = BULK_BLOCK_MAX_BODY_SIZE
+    data = request.get_json(silent=True)
+    valid_ips, invalid_ips, error_response = _parse_bulk_ips(data)
+    if error_response is not None:
+        return error_response
+
+    reason, permanent, duration_hours, error_response = _parse_block_options(data)
+    if error_response is not None:
+        return error_response
+
+    blocked = rate_limiter.block_ips(
+        valid_ips,
+        reason=reason,
+        permanent=permanent,
+        duration_hours=duration_hours
+    )
+
+    return jsonify({
+        'success': True,
+        'blocked': blocked,
+        'invalid': invalid_ips
+    })
+
+
+@app.route('/api/protection/unblock_bulk', methods=['POST'])
+@require_api_key
+def unblock_ips_bulk():
+    """
+    Unblock a list of IP addresses in one request.
+
+    Requires API key authentication if API_KEY is set in environment.
+
+    POST Parameters (JSON body):
+        ips: List of IP addresses to unblock (required, at most BULK_BLOCK_MAX_IPS)
+
+    Returns:
+        JSON response with the number of unblocked and the list of invalid addresses.
+    """
+    if not rate_limiter.enabled:
+        return json_response(_PROTECTION_DISABLED_BODY, 400)
+
+    # Allow a body large enough for BULK_BLOCK_MAX_IPS addresses
+    request.max_content_length = BULK_BLOCK_MAX_BODY_SIZE
+    valid_ips, invalid_ips, error_response = _parse_bulk_ips(request.get_json(silent=True))
+    if error_response is not None:
+        return error_response
+
+    unblocked = rate_limiter.unblock_ips(valid_ips)
+
+    return jsonify({
+        'success': True,
+        'unblocked': unblocked,
+        'invalid': invalid_ips
+    })
+
+
 @app.route('/api/protection/stats', methods=['GET'])
 @require_api_key
 def get_request_stats():
@@ -1081,28 +2305,101 @@ def get_request_stats():
 
     Query Parameters:
         ip: Optional IP address to filter by
-        limit: Maximum number of records (default: 100)
+        limit: Maximum number of records (default: 100); must be positive,
+               larger values are reduced to REQUEST_STATS_MAX_LIMIT
+        before: Optional finite timestamp; only records older than it are returned
+                (pass next_before of the previous response to get the next page)
+        before_id: Optional record id; with before, records with that timestamp
+                   and a smaller id are returned as well (pass next_before_id
+                   of the previous response)
 
     Returns:
-        JSON response with request statistics.
+        JSON response with request statistics. If there may be more records,
+        next_before and next_before_id hold the cursor to request the next page with.
     """
     if not rate_limiter.enabled:
-        return jsonify({
-            'success': False,
-            'error': 'Protection mode is disabled',
-            'stats': []
-        })
+        return json_response(_REQUEST_STATS_DISABLED_BODY)
 
     ip_address = request.args.get('ip')
-    limit = int(request.args.get('limit', 100))
+    try:
+        limit = int(request.args.get('limit', 100))
+        if limit <= 0:
+            raise ValueError('limit must be positive')
+        limit = min(limit, REQUEST_STATS_MAX_LIMIT)
+        before = request.args.get('before')
+        if before is not None:
+            before = float(before)
+            # nan would make every comparison false and silently return an empty page
+            if not math.isfinite(before):
+                raise ValueError('before must be finite')
+        before_id = request.args.get('before_id')
+        if before_id is not None:
+            before_id = int(before_id)
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'error': 'Invalid limit, before or before_id parameter'
+        }), 400
 
-    stats = rate_limiter.get_request_stats(ip_address=ip_address, limit=limit)
+    stats = rate_limiter.get_request_stats(
+        ip_address=ip_address, limit=limit, before=before, before_id=before_id
+    )
 
-    return jsonify({
+    response = {
         'success': True,
         'count': len(stats),
         'stats': stats
-    })
+    }
+    if len(stats) == limit:
+        response['next_before'] = stats[-1]['timestamp']
+        response['next_before_id'] = stats[-1]['id']
+
+    return jsonify(response)
+
+
+@app.errorhandler(RequestEntityTooLarge)
+def request_entity_too_large(e):
+    """
+    Return a JSON error for request bodies larger than the limit of the route.
+
+    The limit is MAX_REQUEST_BODY_SIZE, or the larger limit a view set on the
+    request (BULK_BLOCK_MAX_BODY_SIZE for the bulk block endpoints).
+
+    Returns:
+        JSON response with 413 status code.
+    """
+    max_size = request.max_content_length or MAX_REQUEST_BODY_SIZE
+    return jsonify({
+        'success': False,
+        'error': f'Request body is too large (maximum {max_size} bytes)'
+    }), 413
+
+
+# Static responses, serialized once at import time
+_HEALTH_BODY = serialize_json({
+    'status': 'healthy',
+    'message': 'API is running'
+})
+
+_INDEX_BODY = serialize_json({
+    'name': 'Install Scripts API',
+    'version': '1.2.0',
+    'endpoints': {
+        '/': 'API information (this page)',
+        '/health': 'Health check endpoint',
+        '/api/scripts_list': 'List all available installation scripts (supports ?lang=ru|en)',
+        '/api/script/<script_name>': 'Get information about a single script by script_name (supports ?lang=ru|en)',
+        '/api/install': 'Start an installation script in background (POST: script_name, server_ip, server_root_password, additional) - returns task_id',
+        '/api/status/<task_id>': 'Get installation task status and result (processing, completed, error)',
+        '/api/protection/status': 'Get protection/rate limiting status and configuration',
+        '/api/protection/blocked': 'List all currently blocked IP addresses',
+        '/api/protection/block': 'Manually block an IP address (POST: ip, reason, permanent, duration_hours)',
+        '/api/protection/unblock': 'Unblock an IP address (POST: ip)',
+        '/api/protection/block_bulk': 'Block a list of IP addresses (POST: ips, reason, permanent, duration_hours)',
+        '/api/protection/unblock_bulk': 'Unblock a list of IP addresses (POST: ips)',
+        '/api/protection/stats': 'Get request statistics (supports ?ip=x.x.x.x&limit=N&before=timestamp&before_id=N)'
+    }
+})
 
 
 @app.route('/health', methods=['GET'])
@@ -1114,10 +2411,7 @@ def health():
     Returns:
         JSON response indicating the API is running.
     """
-    return jsonify({
-        'status': 'healthy',
-        'message': 'API is running'
-    })
+    return json_response(_HEALTH_BODY)
 
 
 @app.route('/', methods=['GET'])
@@ -1129,23 +2423,7 @@ def index():
     Returns:
         JSON response with API info and available endpoints.
     """
-    return jsonify({
-        'name': 'Install Scripts API',
-        'version': '1.2.0',
-        'endpoints': {
-            '/': 'API information (this page)',
-            '/health': 'Health check endpoint',
-            '/api/scripts_list': 'List all available installation scripts (supports ?lang=ru|en)',
-            '/api/script/<script_name>': 'Get information about a single script by script_name (supports ?lang=ru|en)',
-            '/api/install': 'Start an installation script in background (POST: script_name, server_ip, server_root_password, additional) - returns task_id',
-            '/api/status/<task_id>': 'Get installation task status and result (processing, completed, error)',
-            '/api/protection/status': 'Get protection/rate limiting status and configuration',
-            '/api/protection/blocked': 'List all currently blocked IP addresses',
-            '/api/protection/block': 'Manually block an IP address (POST: ip, reason, permanent, duration_hours)',
-            '/api/protection/unblock': 'Unblock an IP address (POST: ip)',
-            '/api/protection/stats': 'Get request statistics (supports ?ip=x.x.x.x&limit=N)'
-        }
-    })
+    return json_response(_INDEX_BODY)
 
 
 def parse_args():
@@ -1173,13 +2451,13 @@ def parse_args():
     parser.add_argument(
         '--debug',
         action='store_true',
-        default=True,
-        help='Run in debug mode (default: True)'
+        default=False,
+        help='Run in debug mode (default: False)'
     )
     parser.add_argument(
         '--no-debug',
         action='store_true',
-        help='Disable debug mode'
+        help='Disable debug mode (kept for backward compatibility, debug is off by default)'
     )
     return parser.parse_args()
 
@@ -1189,5 +2467,5 @@ if __name__ == '__main__':
     args = parse_args()
     debug_mode = args.debug and not args.no_debug
 
-    # Development server
-    app.run(host=args.host, port=args.port, debug=debug_mode)
+    # Development server (use gunicorn for production, see README)
+    app.run(host=args.host, port=args.port, debug=debug_mode, threaded=True)
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+ASGI entry point for the Install Scripts API
+
+Wraps the Flask WSGI application so it can be served by an ASGI server
+such as uvicorn or hypercorn. Each request runs in the server's thread
+pool, so slow requests do not block the event loop.
+
+Usage:
+    pip install asgiref uvicorn
+    uvicorn asgi:asgi_app --host 0.0.0.0 --port 5000 --workers 4
+"""
+
+# asgiref is optional - it is only required when serving the API under an ASGI server
+try:
+    from asgiref.wsgi import WsgiToAsgi
+except ImportError as e:
+    raise ImportError(
+        "The ASGI entry point requires the 'asgiref' package. "
+        "Install it with: pip install asgiref uvicorn"
+    ) from e
+
+from app import app
+
+asgi_app = WsgiToAsgi(app)
@@ -18,10 +18,28 @@ import time
 import threading
 import logging
 from datetime import datetime, timedelta
-from contextlib import contextmanager
+from contextlib import closing, contextmanager
 
 logger = logging.getLogger(__name__)
 
+# Size of the memory mapping used by SQLite for reads (in bytes)
+SQLITE_MMAP_SIZE = 64 * 1024 * 1024
+
+# How often record_request removes request log records older than an hour (in seconds)
+REQUEST_LOG_CLEANUP_INTERVAL = 60
+
+# Block an IP, updating an existing block in place (INSERT OR REPLACE would
+# delete the old row and insert a new one with a new id)
+_BLOCK_IP_SQL = '''
+    INSERT INTO blocked_ips (ip_address, reason, blocked_until, is_permanent)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(ip_address) DO UPDATE SET
+        reason = excluded.reason,
+        blocked_until = excluded.blocked_until,
+        is_permanent = excluded.is_permanent,
+        blocked_at = CURRENT_TIMESTAMP
+'''
+
 
 class RateLimiter:
     """
@@ -49,6 +67,10 @@ class RateLimiter:
         self.max_requests = max_requests
         self.time_window = time_window
         self._lock = threading.Lock()
+        # Database connections, one per thread (see _get_connection)
+        self._local = threading.local()
+        # Time after which record_request next cleans up the request log
+        self._next_cleanup = 0.0
 
         if self.enabled:
             self._init_database()
@@ -58,9 +80,17 @@ class RateLimiter:
 
     def _init_database(self):
         """Initialize the SQLite database with required tables."""
-        with self._get_connection() as conn:
+        # A dedicated connection: this runs at import time, which with
+        # gunicorn --preload is before the workers are forked, and SQLite
+        # connections must not be carried over into a forked process
+        with closing(self._connect()) as conn:
             cursor = conn.cursor()
 
+            # WAL is persistent in the database file: readers (stats endpoints)
+            # no longer block writers (record_request) and commits avoid
+            # rewriting the rollback journal
+            cursor.execute('PRAGMA journal_mode=WAL')
+
             # Table to track request history
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS request_log (
@@ -90,27 +120,64 @@ class RateLimiter:
                 ON request_log(ip_address, timestamp)
             ''')
 
+            # Index for the unfiltered statistics query (newest first) and
+            # for the cleanup of old records
             cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_blocked_ips_ip
-                ON blocked_ips(ip_address)
+                CREATE INDEX IF NOT EXISTS idx_request_log_timestamp
+                ON request_log(timestamp)
             ''')
 
+            # blocked_ips lookups use the index of the UNIQUE constraint; a
+            # second index on ip_address (created by older versions) only
+            # doubled the index writes of every block and unblock
+            cursor.execute('DROP INDEX IF EXISTS idx_blocked_ips_ip')
+
             conn.commit()
             logger.debug("Rate limiter database initialized")
 
+    def _connect(self):
+        """
+        Open a new database connection.
+
+        Returns:
+            sqlite3.Connection: Database connection
+        """
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        # Per-connection settings: in WAL mode NORMAL only syncs at checkpoints,
+        # and reads of the small database are served from a memory mapping
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute(f'PRAGMA mmap_size={SQLITE_MMAP_SIZE}')
+        return conn
+
     @contextmanager
     def _get_connection(self):
         """
         Context manager for database connections.
 
+        Each thread opens its connection once and reuses it for later calls,
+        so requests do not pay for opening the database and re-applying the
+        connection settings. An open transaction is rolled back on errors.
+
         Yields:
             sqlite3.Connection: Database connection
         """
-        conn = sqlite3.connect(self.db_path, timeout=10)
-        conn.row_factory = sqlite3.Row
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
         try:
             yield conn
-        finally:
+        except BaseException:
+            conn.rollback()
+            raise
+
+    def close(self):
+        """Close the database connection of the calling thread, if any."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            self._local.conn = None
             conn.close()
 
     def _is_blocked_internal(self, cursor, ip_address):
@@ -164,12 +231,13 @@ class RateLimiter:
         if not self.enabled:
             return False, None
 
-        with self._lock:
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                result = self._is_blocked_internal(cursor, ip_address)
-                conn.commit()
-                return result
+        # No Python-level lock: in WAL mode the SELECT reads a snapshot, and
+        # the only write (removing an expired block) is idempotent
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            result = self._is_blocked_internal(cursor, ip_address)
+            conn.commit()
+            return result
 
     def record_request(self, ip_address, endpoint='/api/install'):
         """
@@ -213,29 +281,27 @@ class RateLimiter:
 
                 count = cursor.fetchone()['count']
 
-                # Clean up old records (older than 1 hour) to prevent database bloat
-                cleanup_time = current_time - 3600
-                cursor.execute('''
-                    DELETE FROM request_log WHERE timestamp < ?
-                ''', (cleanup_time,))
-
-                conn.commit()
+                # Clean up old records (older than 1 hour) to prevent database
+                # bloat; once per interval rather than on every request
+                if current_time >= self._next_cleanup:
+                    self._next_cleanup = current_time + REQUEST_LOG_CLEANUP_INTERVAL
+                    cursor.execute('''
+                        DELETE FROM request_log WHERE timestamp < ?
+                    ''', (current_time - 3600,))
 
                 # Check if rate limit exceeded
                 if count > self.max_requests:
-                    # Auto-block IP for 1 hour
+                    # Auto-block IP for 1 hour (committed together with the request)
                     blocked_until = datetime.now() + timedelta(hours=1)
                     reason = f'Rate limit exceeded: {count} requests in {self.time_window} seconds'
 
-                    cursor.execute('''
-                        INSERT OR REPLACE INTO blocked_ips (ip_address, reason, blocked_until, is_permanent)
-                        VALUES (?, ?, ?, 0)
-                    ''', (ip_address, reason, blocked_until.isoformat()))
+                    cursor.execute(_BLOCK_IP_SQL, (ip_address, reason, blocked_until.isoformat(), 0))
                     conn.commit()
 
                     logger.warning(f"IP {ip_address} blocked: {reason}")
                     return False, count, reason
 
+                conn.commit()
                 return True, count, None
 
     def block_ip(self, ip_address, reason='Manual block', permanent=False, duration_hours=None):
@@ -262,10 +328,7 @@ class RateLimiter:
                 if not permanent and duration_hours:
                     blocked_until = (datetime.now() + timedelta(hours=duration_hours)).isoformat()
 
-                cursor.execute('''
-                    INSERT OR REPLACE INTO blocked_ips (ip_address, reason, blocked_until, is_permanent)
-                    VALUES (?, ?, ?, ?)
-                ''', (ip_address, reason, blocked_until, 1 if permanent else 0))
+                cursor.execute(_BLOCK_IP_SQL, (ip_address, reason, blocked_until, 1 if permanent else 0))
 
                 conn.commit()
                 logger.info(f"IP {ip_address} blocked: {reason}")
@@ -297,6 +360,59 @@ class RateLimiter:
                     return True
                 return False
 
+    def block_ips(self, ip_addresses, reason='Manual block', permanent=False, duration_hours=None):
+        """
+        Manually block several IP addresses in a single transaction.
+
+        Args:
+            ip_addresses: IP addresses to block
+            reason: Reason for blocking
+            permanent: Whether the blocks are permanent
+            duration_hours: Duration of the blocks in hours (if not permanent)
+
+        Returns:
+            int: Number of blocked IP addresses
+        """
+        if not self.enabled:
+            return 0
+
+        blocked_until = None
+        if not permanent and duration_hours:
+            blocked_until = (datetime.now() + timedelta(hours=duration_hours)).isoformat()
+        rows = [(ip_address, reason, blocked_until, 1 if permanent else 0) for ip_address in ip_addresses]
+
+        with self._lock:
+            with self._get_connection() as conn:
+                conn.executemany(_BLOCK_IP_SQL, rows)
+                conn.commit()
+
+        logger.info(f"{len(rows)} IPs blocked: {reason}")
+        return len(rows)
+
+    def unblock_ips(self, ip_addresses):
+        """
+        Unblock several IP addresses in a single transaction.
+
+        Args:
+            ip_addresses: IP addresses to unblock
+
+        Returns:
+            int: Number of IP addresses that were blocked and are now unblocked
+        """
+        if not self.enabled:
+            return 0
+
+        with self._lock:
+            with self._get_connection() as conn:
+                cursor = conn.executemany('''
+                    DELETE FROM blocked_ips WHERE ip_address = ?
+                ''', [(ip_address,) for ip_address in ip_addresses])
+                conn.commit()
+
+        if cursor.rowcount > 0:
+            logger.info(f"{cursor.rowcount} IPs unblocked")
+        return cursor.rowcount
+
     def get_blocked_ips(self):
         """
         Get list of all currently blocked IPs.
@@ -317,13 +433,23 @@ class RateLimiter:
 
             return [dict(row) for row in cursor.fetchall()]
 
-    def get_request_stats(self, ip_address=None, limit=100):
+    def get_request_stats(self, ip_address=None, limit=100, before=None, before_id=None):
         """
-        Get request statistics.
+        Get request statistics, newest first.
+
+        Older records are paged through with keyset pagination on
+        (timestamp, id): pass the timestamp and id of the last record of a
+        page as before and before_id to get the next one. The id keeps
+        records sharing a timestamp from being skipped at a page boundary.
+        Each page is an index range scan of at most limit rows.
 
         Args:
             ip_address: Optional IP to filter by
             limit: Maximum number of records to return
+            before: Optional timestamp; only records older than it are returned
+            before_id: Optional id of the last record of the previous page;
+                       records with the before timestamp and a smaller id
+                       are returned as well
 
         Returns:
             list: List of request log entries
@@ -331,26 +457,40 @@ class RateLimiter:
         if not self.enabled:
             return []
 
+        conditions = []
+        params = []
+        if ip_address:
+            conditions.append('ip_address = ?')
+            params.append(ip_address)
+        if before is not None and before_id is not None:
+            # Same as (timestamp < ? OR (timestamp = ? AND id < ?)), written
+            # so that the timestamp bound is still used for the index range scan
+            conditions.append('timestamp <= ? AND (timestamp < ? OR id < ?)')
+            params.extend((before, before, before_id))
+        elif before is not None:
+            conditions.append('timestamp < ?')
+            params.append(before)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        params.append(limit)
+
         with self._get_connection() as conn:
             cursor = conn.cursor()
+            # Plain tuples: the dicts are built directly, without creating
+            # an intermediate sqlite3.Row for every record
+            cursor.row_factory = None
 
-            if ip_address:
-                cursor.execute('''
-                    SELECT ip_address, endpoint, timestamp, created_at
-                    FROM request_log
-                    WHERE ip_address = ?
-                    ORDER BY timestamp DESC
-                    LIMIT ?
-                ''', (ip_address, limit))
-            else:
-                cursor.execute('''
-                    SELECT ip_address, endpoint, timestamp, created_at
-                    FROM request_log
-                    ORDER BY timestamp DESC
-                    LIMIT ?
-                ''', (limit,))
-
-            return [dict(row) for row in cursor.fetchall()]
+            cursor.execute(f'''
+                SELECT id, ip_address, endpoint, timestamp, created_at
+                FROM request_log
+                {where}
+                ORDER BY timestamp DESC, id DESC
+                LIMIT ?
+            ''', params)
+
+            return [
+                {'id': row_id, 'ip_address': ip, 'endpoint': endpoint, 'timestamp': timestamp, 'created_at': created_at}
+                for row_id, ip, endpoint, timestamp, created_at in cursor
+            ]
 
     def get_ip_request_count(self, ip_address):
         """
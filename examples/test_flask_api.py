@@ -7,96 +7,81 @@ Run this script from the repository root directory.
 """
 
 import os
+import gzip
+import hashlib
+import io
+import shutil
 import sys
 import json
+import tempfile
+import threading
+import time
 import unittest
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
 
 # Add the api directory to the path
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'api'))
 
+# Write task reports and the rate limiter database to a temporary directory
+# instead of api/, so that concurrent test runs (e.g. pytest -n auto) do not
+# share them (both paths are read when the app module is imported)
+_TEST_STATE_DIR = tempfile.mkdtemp(prefix='install-scripts-tests-')
+os.environ['TASKS_DIR'] = os.path.join(_TEST_STATE_DIR, 'tasks')
+os.environ['RATE_LIMITER_DB_PATH'] = os.path.join(_TEST_STATE_DIR, 'rate_limiter.db')
+
 from app import (
-    app, parse_args, execute_script_via_ssh, SSH_AVAILABLE,
+    app, parse_args, execute_script_via_ssh, execute_script_via_ssh_async, SSH_AVAILABLE,
     generate_task_id, get_task_file_path, write_task_status, read_task_status,
-    delete_task_file, append_task_content, strip_ansi_codes,
+    delete_task_file, append_task_content, finish_task, cleanup_old_task_files,
+    strip_ansi_codes, strip_ansi_bytes, load_scripts, load_scripts_index, load_script_body,
+    load_local_script, close_ssh_pool, open_task_report, ORJSON_AVAILABLE,
+    BoundedOutputBuffer, TaskReportStream, is_valid_ipv4, escape_shell_args, serialize_json,
     TASK_STATUS_PROCESSING, TASK_STATUS_COMPLETED, TASK_STATUS_ERROR,
-    TASKS_DIR
+    TASKS_DIR, SCRIPTS_DIR, MAX_REQUEST_BODY_SIZE, BULK_BLOCK_MAX_IPS, BULK_BLOCK_MAX_BODY_SIZE
 )
 
 
-class TestParseArgs(unittest.TestCase):
-    """Test cases for command-line argument parsing."""
-
-    def test_parse_args_defaults(self):
-        """Test that default arguments are set correctly."""
-        # Test with empty arguments (default values)
-        import sys
-        original_argv = sys.argv
-        sys.argv = ['app.py']
-        try:
-            args = parse_args()
-            self.assertEqual(args.port, 5000)
-            self.assertEqual(args.host, '0.0.0.0')
-            self.assertTrue(args.debug)
-            self.assertFalse(args.no_debug)
-        finally:
-            sys.argv = original_argv
-
-    def test_parse_args_custom_port(self):
-        """Test that custom port argument is parsed correctly."""
-        import sys
-        original_argv = sys.argv
-        sys.argv = ['app.py', '--port', '8080']
-        try:
-            args = parse_args()
-            self.assertEqual(args.port, 8080)
-        finally:
-            sys.argv = original_argv
+def tearDownModule():
+    """Remove the temporary tasks directory and rate limiter database."""
+    shutil.rmtree(_TEST_STATE_DIR, ignore_errors=True)
 
-    def test_parse_args_custom_host(self):
-        """Test that custom host argument is parsed correctly."""
-        import sys
-        original_argv = sys.argv
-        sys.argv = ['app.py', '--host', '127.0.0.1']
-        try:
-            args = parse_args()
-            self.assertEqual(args.host, '127.0.0.1')
-        finally:
-            sys.argv = original_argv
 
-    def test_parse_args_no_debug(self):
-        """Test that --no-debug argument works correctly."""
-        import sys
-        original_argv = sys.argv
-        sys.argv = ['app.py', '--no-debug']
-        try:
-            args = parse_args()
-            self.assertTrue(args.no_debug)
-        finally:
-            sys.argv = original_argv
+class TestParseArgs(unittest.TestCase):
+    """Test cases for command-line argument parsing."""
 
-    def test_parse_args_combined(self):
-        """Test that multiple arguments can be combined."""
-        import sys
-        original_argv = sys.argv
-        sys.argv = ['app.py', '--port', '3000', '--host', 'localhost', '--no-debug']
-        try:
-            args = parse_args()
-            self.assertEqual(args.port, 3000)
-            self.assertEqual(args.host, 'localhost')
-            self.assertTrue(args.no_debug)
-        finally:
-            sys.argv = original_argv
+    # (command line, expected argument values)
+    CASES = [
+        (['app.py'], {'port': 5000, 'host': '0.0.0.0', 'debug': False, 'no_debug': False}),
+        (['app.py', '--debug'], {'debug': True}),
+        (['app.py', '--port', '8080'], {'port': 8080}),
+        (['app.py', '--host', '127.0.0.1'], {'host': '127.0.0.1'}),
+        (['app.py', '--no-debug'], {'no_debug': True}),
+        (['app.py', '--port', '3000', '--host', 'localhost', '--no-debug'],
+         {'port': 3000, 'host': 'localhost', 'no_debug': True}),
+    ]
+
+    def test_parse_args(self):
+        """Test that defaults and each argument (alone and combined) are parsed correctly."""
+        for argv, expected in self.CASES:
+            with self.subTest(argv=argv), patch.object(sys, 'argv', argv):
+                args = parse_args()
+                for name, value in expected.items():
+                    self.assertEqual(getattr(args, name), value)
 
 
 class TestFlaskAPI(unittest.TestCase):
     """Test cases for Flask API endpoints."""
 
-    def setUp(self):
-        """Set up test client."""
-        self.app = app
-        self.app.config['TESTING'] = True
-        self.client = self.app.test_client()
+    @classmethod
+    def setUpClass(cls):
+        """Set up a test client shared by the tests of the class."""
+        cls.app = app
+        cls.app.config['TESTING'] = True
+        cls.client = cls.app.test_client()
+        # The script list is requested once and shared by the tests that only inspect it
+        cls.scripts_list_response = cls.client.get('/api/scripts_list')
+        cls.scripts_list = cls.scripts_list_response.get_json()
 
     def test_index_endpoint(self):
         """Test the root endpoint returns API info."""
@@ -115,9 +100,8 @@ class TestFlaskAPI(unittest.TestCase):
 
     def test_scripts_list_endpoint(self):
         """Test the scripts_list endpoint returns list of scripts."""
-        response = self.client.get('/api/scripts_list')
-        self.assertEqual(response.status_code, 200)
-        data = response.get_json()
+        self.assertEqual(self.scripts_list_response.status_code, 200)
+        data = self.scripts_list
         self.assertTrue(data['success'])
         self.assertIn('scripts', data)
         self.assertIn('count', data)
@@ -126,18 +110,14 @@ class TestFlaskAPI(unittest.TestCase):
 
     def test_scripts_list_contains_expected_scripts(self):
         """Test that scripts_list contains expected installation scripts."""
-        response = self.client.get('/api/scripts_list')
-        data = response.get_json()
-        script_names = [s['script_name'] for s in data['scripts']]
+        script_names = [s['script_name'] for s in self.scripts_list['scripts']]
         # Check that our installation scripts are present
         self.assertIn('various-useful-api-django', script_names)
         self.assertIn('install-scripts-api-flask', script_names)
 
     def test_scripts_list_names_without_extension(self):
         """Test that script names are returned without file extensions."""
-        response = self.client.get('/api/scripts_list')
-        data = response.get_json()
-        script_names = [s['script_name'] for s in data['scripts']]
+        script_names = [s['script_name'] for s in self.scripts_list['scripts']]
         # Verify that no script names contain file extensions
         for script_name in script_names:
             self.assertNotIn('.sh', script_name, f"Script name '{script_name}' should not contain extension")
@@ -160,34 +140,68 @@ class TestFlaskAPI(unittest.TestCase):
         self.assertIn('error', data)
         self.assertIsNone(data['result'])
 
-    def test_get_script_with_lang_param(self):
-        """Test the /api/script/<script_name> endpoint with lang parameter."""
-        # Test with English
-        response = self.client.get('/api/script/various-useful-api-django?lang=en')
+    def test_scripts_list_conditional_request(self):
+        """Test that scripts_list returns 304 when the ETag matches."""
+        response = self.client.get('/api/scripts_list')
+        etag = response.headers.get('ETag')
+        self.assertIsNotNone(etag)
+        self.assertIn('Last-Modified', response.headers)
+
+        response = self.client.get('/api/scripts_list', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+
+    def test_scripts_list_gzip(self):
+        """Test that scripts_list is gzip-compressed when the client accepts it."""
+        plain = self.client.get('/api/scripts_list')
+        self.assertIsNone(plain.headers.get('Content-Encoding'))
+        self.assertIn('Accept-Encoding', plain.headers.get('Vary', ''))
+
+        response = self.client.get('/api/scripts_list', headers={'Accept-Encoding': 'gzip'})
         self.assertEqual(response.status_code, 200)
-        data = response.get_json()
-        self.assertTrue(data['success'])
-        self.assertIn('result', data)
-        # English description should contain "A collection of useful APIs"
-        self.assertIn('A collection of useful APIs', data['result']['description'])
+        self.assertEqual(response.headers.get('Content-Encoding'), 'gzip')
+        self.assertNotEqual(response.headers.get('ETag'), plain.headers.get('ETag'))
+        self.assertEqual(gzip.decompress(response.data), plain.data)
+
+    def test_get_script_conditional_request(self):
+        """Test that get_script returns 304 when the ETag matches."""
+        response = self.client.get('/api/script/various-useful-api-django')
+        etag = response.headers.get('ETag')
+        self.assertIsNotNone(etag)
+
+        response = self.client.get('/api/script/various-useful-api-django',
+                                   headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
 
-        # Test with Russian (default)
-        response = self.client.get('/api/script/various-useful-api-django?lang=ru')
+        response = self.client.get('/api/script/various-useful-api-django',
+                                   headers={'If-None-Match': '"stale"'})
         self.assertEqual(response.status_code, 200)
-        data = response.get_json()
-        self.assertTrue(data['success'])
-        # Russian description should contain "Набор полезных API"
-        self.assertIn('Набор полезных API', data['result']['description'])
+
+    def test_data_file_not_found(self):
+        """Test that both data endpoints return 404 when the data file is missing."""
+        with patch('app.DATA_DIR', '/nonexistent-data-dir'):
+            response = self.client.get('/api/scripts_list')
+            self.assertEqual(response.status_code, 404)
+            self.assertEqual(response.get_json()['error'], 'Data file not found')
+
+            response = self.client.get('/api/script/various-useful-api-django')
+            self.assertEqual(response.status_code, 404)
+            self.assertEqual(response.get_json()['error'], 'Data file not found')
+
+    def test_get_script_with_lang_param(self):
+        """Test the /api/script/<script_name> endpoint with lang parameter."""
+        for lang, description in (('en', 'A collection of useful APIs'), ('ru', 'Набор полезных API')):
+            with self.subTest(lang=lang):
+                response = self.client.get(f'/api/script/various-useful-api-django?lang={lang}')
+                self.assertEqual(response.status_code, 200)
+                data = response.get_json()
+                self.assertTrue(data['success'])
+                self.assertIn(description, data['result']['description'])
 
     def test_get_script_all_scripts(self):
         """Test that all scripts in data file can be retrieved individually."""
-        # Get all scripts first
-        response = self.client.get('/api/scripts_list')
-        data = response.get_json()
-        scripts = data['scripts']
-
-        # Test each script can be retrieved
-        for script in scripts:
+        # Test each script of the list can be retrieved
+        for script in self.scripts_list['scripts']:
             script_name = script['script_name']
             response = self.client.get(f'/api/script/{script_name}')
             self.assertEqual(response.status_code, 200, f"Failed to get script: {script_name}")
@@ -195,24 +209,312 @@ class TestFlaskAPI(unittest.TestCase):
             self.assertTrue(script_data['success'])
             self.assertEqual(script_data['result']['script_name'], script_name)
 
+    def test_protection_endpoints_when_disabled(self):
+        """Test the protection endpoints when protection mode is disabled."""
+        with patch('app.rate_limiter.enabled', False):
+            response = self.client.get('/api/protection/blocked')
+            self.assertEqual(response.status_code, 200)
+            data = response.get_json()
+            self.assertFalse(data['success'])
+            self.assertEqual(data['blocked_ips'], [])
+
+            response = self.client.post('/api/protection/block', json={'ip': '192.168.1.1'})
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.get_json()['error'], 'Protection mode is disabled')
+
+    def test_unblock_rejects_invalid_ip(self):
+        """Test that unblocking an invalid IP address fails without touching the database."""
+        with patch('app.rate_limiter.enabled', True), \
+                patch('app.rate_limiter.unblock_ip') as mock_unblock:
+            response = self.client.post('/api/protection/unblock', json={'ip': '999.1.1.1'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()['error'], 'Invalid IP address format')
+        mock_unblock.assert_not_called()
+
+    def test_block_bulk_skips_invalid_ips(self):
+        """Test that /api/protection/block_bulk blocks valid IPs once and reports invalid ones."""
+        with patch('app.rate_limiter.enabled', True), \
+                patch('app.rate_limiter.block_ips', return_value=2) as mock_block:
+            response = self.client.post('/api/protection/block_bulk', json={
+                'ips': ['10.0.0.1', 'bad', '10.0.0.2', '10.0.0.1'],
+                'permanent': True
+            })
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.get_json(), {'success': True, 'blocked': 2, 'invalid': ['bad']})
+            self.assertEqual(mock_block.call_args[0][0], ['10.0.0.1', '10.0.0.2'])
+
+            response = self.client.post('/api/protection/block_bulk', json={'ips': ['bad']})
+            self.assertEqual(response.status_code, 400)
+
+            response = self.client.post('/api/protection/unblock_bulk', json={'ips': '10.0.0.1'})
+            self.assertEqual(response.status_code, 400)
+
+    def test_block_bulk_rejects_invalid_input(self):
+        """Test that bulk endpoints return a JSON 400 for malformed bodies and block settings."""
+        cases = [
+            ('array body', '/api/protection/block_bulk', [1], 'must be a JSON object'),
+            ('array body (unblock)', '/api/protection/unblock_bulk', ['10.0.0.1'], 'must be a JSON object'),
+            ('string duration', '/api/protection/block_bulk',
+             {'ips': ['10.9.9.5'], 'duration_hours': '2'}, 'duration_hours'),
+            ('boolean duration', '/api/protection/block_bulk',
+             {'ips': ['10.9.9.5'], 'duration_hours': True}, 'duration_hours'),
+            ('zero duration', '/api/protection/block_bulk',
+             {'ips': ['10.9.9.5'], 'duration_hours': 0}, 'duration_hours'),
+            ('negative duration', '/api/protection/block_bulk',
+             {'ips': ['10.9.9.5'], 'duration_hours': -1}, 'duration_hours'),
+            ('huge duration', '/api/protection/block_bulk',
+             {'ips': ['10.9.9.5'], 'duration_hours': 1e300}, 'duration_hours'),
+            ('string permanent', '/api/protection/block_bulk',
+             {'ips': ['10.9.9.5'], 'permanent': 'yes'}, 'permanent'),
+            ('object reason', '/api/protection/block_bulk',
+             {'ips': ['10.9.9.5'], 'reason': {'text': 'spam'}}, 'reason'),
+        ]
+        with patch('app.rate_limiter.enabled', True), \
+                patch('app.rate_limiter.block_ips', return_value=1) as mock_block, \
+                patch('app.rate_limiter.unblock_ips') as mock_unblock:
+            for description, endpoint, body, error in cases:
+                with self.subTest(description):
+                    response = self.client.post(endpoint, json=body)
+                    self.assertEqual(response.status_code, 400)
+                    self.assertEqual(response.mimetype, 'application/json')
+                    self.assertIn(error, response.get_json()['error'])
+
+            response = self.client.post('/api/protection/block_bulk', json={
+                'ips': ['10.9.9.5'], 'reason': 'Spam', 'permanent': False, 'duration_hours': 2.5
+            })
+            self.assertEqual(response.status_code, 200)
+        mock_block.assert_called_once_with(['10.9.9.5'], reason='Spam', permanent=False, duration_hours=2.5)
+        mock_unblock.assert_not_called()
+
+    def test_bulk_endpoints_accept_max_ips(self):
+        """Test that a batch of BULK_BLOCK_MAX_IPS addresses fits the request body limit."""
+        # Longest addresses, so the body is as large as a valid batch can be
+        ips = [f'1{i // 100:02d}.1{i % 100:02d}.255.255' for i in range(BULK_BLOCK_MAX_IPS)]
+        body = json.dumps({'ips': ips, 'reason': 'Abuse'})
+        self.assertGreater(len(body), MAX_REQUEST_BODY_SIZE)
+        with patch('app.rate_limiter.enabled', True), \
+                patch('app.rate_limiter.block_ips', return_value=len(ips)) as mock_block, \
+                patch('app.rate_limiter.unblock_ips', return_value=len(ips)) as mock_unblock:
+            response = self.client.post('/api/protection/block_bulk', data=body,
+                                        content_type='application/json')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.get_json()['blocked'], BULK_BLOCK_MAX_IPS)
+            self.assertEqual(mock_block.call_args[0][0], ips)
+
+            response = self.client.post('/api/protection/unblock_bulk', data=body,
+                                        content_type='application/json')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.get_json()['unblocked'], BULK_BLOCK_MAX_IPS)
+            self.assertEqual(mock_unblock.call_args[0][0], ips)
+
+    def test_bulk_endpoints_report_their_body_limit(self):
+        """Test that the 413 error of the bulk endpoints reports their own body size limit."""
+        body = {'ips': ['10.0.0.1'], 'reason': 'x' * BULK_BLOCK_MAX_BODY_SIZE}
+        with patch('app.rate_limiter.enabled', True), \
+                patch('app.rate_limiter.block_ips') as mock_block, \
+                patch('app.rate_limiter.unblock_ips') as mock_unblock:
+            for endpoint in ('/api/protection/block_bulk', '/api/protection/unblock_bulk'):
+                with self.subTest(endpoint=endpoint):
+                    response = self.client.post(endpoint, json=body)
+                    self.assertEqual(response.status_code, 413)
+                    self.assertIn(f'maximum {BULK_BLOCK_MAX_BODY_SIZE} bytes', response.get_json()['error'])
+
+            response = self.client.post('/api/protection/block', json=body)
+            self.assertEqual(response.status_code, 413)
+            self.assertIn(f'maximum {MAX_REQUEST_BODY_SIZE} bytes', response.get_json()['error'])
+        mock_block.assert_not_called()
+        mock_unblock.assert_not_called()
+
+    def test_bulk_endpoints_reject_too_many_ips(self):
+        """Test that a batch over BULK_BLOCK_MAX_IPS addresses is rejected."""
+        ips = [f'1{i // 100:02d}.1{i % 100:02d}.255.255' for i in range(BULK_BLOCK_MAX_IPS + 1)]
+        with patch('app.rate_limiter.enabled', True), \
+                patch('app.rate_limiter.block_ips') as mock_block, \
+                patch('app.rate_limiter.unblock_ips') as mock_unblock:
+            for endpoint in ('/api/protection/block_bulk', '/api/protection/unblock_bulk'):
+                with self.subTest(endpoint=endpoint):
+                    response = self.client.post(endpoint, json={'ips': ips})
+                    self.assertEqual(response.status_code, 400)
+                    self.assertIn('Too many IP addresses', response.get_json()['error'])
+        mock_block.assert_not_called()
+        mock_unblock.assert_not_called()
+
+    def test_request_stats_pagination_parameters(self):
+        """Test that /api/protection/stats caps limit, passes before and returns next_before."""
+        stats = [{'id': 7, 'ip_address': '10.0.0.1', 'endpoint': '/api/install', 'timestamp': 5.0, 'created_at': ''}]
+        with patch('app.rate_limiter.enabled', True), \
+                patch('app.rate_limiter.get_request_stats', return_value=stats) as mock_stats:
+            response = self.client.get('/api/protection/stats?limit=1&before=10.5&before_id=9')
+            data = response.get_json()
+            self.assertEqual(data['next_before'], 5.0)
+            self.assertEqual(data['next_before_id'], 7)
+            mock_stats.assert_called_once_with(ip_address=None, limit=1, before=10.5, before_id=9)
+
+            response = self.client.get('/api/protection/stats?limit=1000000')
+            self.assertNotIn('next_before', response.get_json())
+            self.assertEqual(mock_stats.call_args.kwargs['limit'], 5000)
+
+            for query in ('before=yesterday', 'before=10.5&before_id=last', 'before=nan',
+                          'before=inf', 'before=-inf', 'limit=0', 'limit=-5', 'limit=ten'):
+                with self.subTest(query=query):
+                    response = self.client.get(f'/api/protection/stats?{query}')
+                    self.assertEqual(response.status_code, 400)
+            self.assertEqual(mock_stats.call_count, 2)
+
+    @unittest.skipIf(not ORJSON_AVAILABLE, "orjson not installed")
+    def test_jsonify_matches_serialize_json(self):
+        """Test that jsonify() produces the same body as the pre-serialized responses."""
+        data = {'success': False, 'error': 'Ошибка', 'count': 1}
+        with self.app.test_request_context():
+            response = self.app.json.response(data)
+        self.assertEqual(response.mimetype, 'application/json')
+        self.assertEqual(json.loads(response.get_data()), data)
+        self.assertEqual(response.get_data(), serialize_json(data))
+
+
+class TestIsValidIpv4(unittest.TestCase):
+    """Test cases for the is_valid_ipv4 function."""
+
+    def test_valid_addresses(self):
+        """Test that dotted-decimal IPv4 addresses are accepted."""
+        for value in ('192.168.1.1', '0.0.0.0', '255.255.255.255'):
+            self.assertTrue(is_valid_ipv4(value), value)
+
+    def test_invalid_addresses(self):
+        """Test that malformed or out-of-range values are rejected."""
+        for value in ('999.999.999.999', '1.2.3', '1', '01.2.3.4', ' 1.2.3.4',
+                      '1.2.3.4\n', '1.2.3.4\x00', 'invalid-ip', '', None, 3232235777):
+            self.assertFalse(is_valid_ipv4(value), repr(value))
+
+
+class TestEscapeShellArgs(unittest.TestCase):
+    """Test cases for escaping additional script parameters."""
+
+    def test_empty(self):
+        """Test that empty parameters produce no arguments."""
+        self.assertEqual(escape_shell_args(''), '')
+        self.assertEqual(escape_shell_args(None), '')
+
+    def test_splits_on_whitespace(self):
+        """Test that parameters are split into separate arguments."""
+        self.assertEqual(escape_shell_args('example.com  admin@example.com'), 'example.com admin@example.com')
+
+    def test_quotes_shell_metacharacters(self):
+        """Test that shell metacharacters cannot escape the argument."""
+        self.assertEqual(escape_shell_args("it's;rm"), "'it'\"'\"'s;rm'")
+        self.assertEqual(escape_shell_args('$(id)'), "'$(id)'")
+
+
+class TestApiKeyAuthentication(unittest.TestCase):
+    """Test cases for API key authentication."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up a test client shared by the tests of the class."""
+        cls.app = app
+        cls.app.config['TESTING'] = True
+        cls.client = cls.app.test_client()
+
+    def test_valid_api_key_header(self):
+        """Test that a matching X-API-Key header is accepted."""
+        with patch('app.API_KEY', 'secret-key'):
+            response = self.client.get('/health', headers={'X-API-Key': 'secret-key'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_valid_api_key_query_param(self):
+        """Test that a matching api_key query parameter is accepted."""
+        with patch('app.API_KEY', 'secret-key'):
+            response = self.client.get('/health?api_key=secret-key')
+        self.assertEqual(response.status_code, 200)
+
+    def test_invalid_api_key(self):
+        """Test that a wrong API key is rejected."""
+        with patch('app.API_KEY', 'secret-key'):
+            response = self.client.get('/health', headers={'X-API-Key': 'secret-kez'})
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.get_json()['error'], 'Invalid API key')
+
+    def test_missing_api_key(self):
+        """Test that a missing API key is rejected when API_KEY is set."""
+        with patch('app.API_KEY', 'secret-key'):
+            response = self.client.get('/health')
+        self.assertEqual(response.status_code, 401)
+
+
+class TestLoadScripts(unittest.TestCase):
+    """Test cases for the cached data file loader."""
+
+    def setUp(self):
+        """Create a temporary data file."""
+        fd, self.data_file = tempfile.mkstemp(suffix='.json')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump([{'script_name': 'first'}], f)
+
+    def tearDown(self):
+        """Remove the temporary data file."""
+        try:
+            os.remove(self.data_file)
+        except FileNotFoundError:
+            pass
+
+    def test_load_scripts_returns_cached_list(self):
+        """Test that an unchanged file is served from the cache."""
+        scripts1 = load_scripts(self.data_file)
+        scripts2 = load_scripts(self.data_file)
+        self.assertEqual(scripts1, [{'script_name': 'first'}])
+        self.assertIs(scripts1, scripts2)
+
+    def test_load_scripts_reloads_modified_file(self):
+        """Test that the cache is invalidated when the file changes."""
+        load_scripts(self.data_file)
+        with open(self.data_file, 'w', encoding='utf-8') as f:
+            json.dump([{'script_name': 'first'}, {'script_name': 'second'}], f)
+        scripts = load_scripts(self.data_file)
+        self.assertEqual(len(scripts), 2)
+
+    def test_load_scripts_index(self):
+        """Test that scripts are indexed by script_name."""
+        index = load_scripts_index(self.data_file)
+        self.assertEqual(index, {'first': {'script_name': 'first'}})
+        self.assertIs(index['first'], load_scripts(self.data_file)[0])
+
+    def test_load_script_body(self):
+        """Test that script response bodies are serialized and cached."""
+        body = load_script_body(self.data_file, 'first')
+        self.assertEqual(json.loads(body), {'success': True, 'result': {'script_name': 'first'}})
+        self.assertIs(load_script_body(self.data_file, 'first'), body)
+        self.assertIsNone(load_script_body(self.data_file, 'missing'))
+
+    def test_load_scripts_invalid_json(self):
+        """Test that invalid JSON raises json.JSONDecodeError with either parser."""
+        with open(self.data_file, 'w', encoding='utf-8') as f:
+            f.write('[{"script_name": ')
+        with self.assertRaises(json.JSONDecodeError):
+            load_scripts(self.data_file)
+
 
 class TestInstallEndpoint(unittest.TestCase):
     """Test cases for the /api/install endpoint."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Set up a test client shared by the tests of the class."""
+        cls.app = app
+        cls.app.config['TESTING'] = True
+        cls.client = cls.app.test_client()
+
     def setUp(self):
-        """Set up test client."""
-        self.app = app
-        self.app.config['TESTING'] = True
-        self.client = self.app.test_client()
+        """Keep accepted installations from connecting to the test servers."""
+        patcher = patch('app.execute_script_via_ssh_async')
+        self.mock_execute = patcher.start()
+        self.addCleanup(patcher.stop)
 
     def tearDown(self):
         """Clean up any task files created during tests."""
-        import glob
-        for f in glob.glob(os.path.join(TASKS_DIR, '*.txt')):
-            try:
-                os.remove(f)
-            except:
-                pass
+        with os.scandir(TASKS_DIR) as entries:
+            for entry in entries:
+                if entry.name.endswith('.txt'):
+                    os.remove(entry.path)
 
     def test_install_endpoint_missing_body(self):
         """Test that /api/install returns 400 when no JSON body is provided."""
@@ -222,12 +524,25 @@ class TestInstallEndpoint(unittest.TestCase):
         self.assertFalse(data['success'])
         self.assertIn('error', data)
 
+    def test_install_endpoint_body_too_large(self):
+        """Test that /api/install rejects oversized request bodies with 413."""
+        response = self.client.post('/api/install',
+                                    json={
+                                        'script_name': 'test-script',
+                                        'server_ip': '192.168.1.1',
+                                        'server_root_password': 'password',
+                                        'additional': 'x' * 100000
+                                    })
+        self.assertEqual(response.status_code, 413)
+        data = response.get_json()
+        self.assertFalse(data['success'])
+        self.assertIn('too large', data['error'])
+
     def test_install_endpoint_missing_fields(self):
         """Test that /api/install returns 400 when required fields are missing."""
         # Missing all required fields
         response = self.client.post('/api/install',
-                                    data=json.dumps({}),
-                                    content_type='application/json')
+                                    json={})
         self.assertEqual(response.status_code, 400)
         data = response.get_json()
         self.assertFalse(data['success'])
@@ -235,77 +550,187 @@ class TestInstallEndpoint(unittest.TestCase):
 
         # Missing server_ip and server_root_password
         response = self.client.post('/api/install',
-                                    data=json.dumps({'script_name': 'test'}),
-                                    content_type='application/json')
+                                    json={'script_name': 'test'})
         self.assertEqual(response.status_code, 400)
         data = response.get_json()
         self.assertFalse(data['success'])
         self.assertIn('server_ip', data['error'])
 
+    def test_install_endpoint_malformed_body(self):
+        """Test that /api/install returns 400 for JSON bodies of the wrong shape."""
+        valid = {'script_name': 'test-script', 'server_ip': '192.168.1.1', 'server_root_password': 'password'}
+        cases = [
+            ('array body', [1], 'must be a JSON object'),
+            ('string body', 'test-script', 'must be a JSON object'),
+            ('integer script_name', {**valid, 'script_name': 123}, 'script_name'),
+            ('list server_ip', {**valid, 'server_ip': ['192.168.1.1']}, 'server_ip'),
+            ('integer password', {**valid, 'server_root_password': 1234}, 'server_root_password'),
+            ('object additional', {**valid, 'additional': {'domain': 'example.com'}}, 'additional'),
+            ('boolean additional', {**valid, 'additional': True}, 'additional'),
+        ]
+        with patch('app.rate_limiter.enabled', False):
+            for description, body, error in cases:
+                with self.subTest(description):
+                    response = self.client.post('/api/install', json=body)
+                    self.assertEqual(response.status_code, 400)
+                    data = response.get_json()
+                    self.assertFalse(data['success'])
+                    self.assertIn(error, data['error'])
+        self.mock_execute.assert_not_called()
+
     def test_install_endpoint_invalid_script_name(self):
         """Test that /api/install returns 400 for invalid script_name format."""
         response = self.client.post('/api/install',
-                                    data=json.dumps({
+                                    json={
                                         'script_name': 'test; rm -rf /',
                                         'server_ip': '192.168.1.1',
                                         'server_root_password': 'password'
-                                    }),
-                                    content_type='application/json')
+                                    })
         self.assertEqual(response.status_code, 400)
         data = response.get_json()
         self.assertFalse(data['success'])
         self.assertIn('Invalid script_name format', data['error'])
 
+    def test_install_endpoint_non_ascii_script_name(self):
+        """Test that script_name validation rejects non-ASCII letters and trailing newlines."""
+        with patch('app.rate_limiter.enabled', False):
+            for name in ('скрипт', 'test\n'):
+                response = self.client.post('/api/install',
+                                            json={
+                                                'script_name': name,
+                                                'server_ip': '192.168.1.1',
+                                                'server_root_password': 'password'
+                                            })
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('Invalid script_name format', response.get_json()['error'])
+
     def test_install_endpoint_invalid_ip(self):
         """Test that /api/install returns 400 for invalid IP address."""
         response = self.client.post('/api/install',
-                                    data=json.dumps({
+                                    json={
                                         'script_name': 'test-script',
                                         'server_ip': 'invalid-ip',
                                         'server_root_password': 'password'
-                                    }),
-                                    content_type='application/json')
+                                    })
         self.assertEqual(response.status_code, 400)
         data = response.get_json()
         self.assertFalse(data['success'])
         self.assertIn('Invalid server_ip format', data['error'])
 
+    def test_install_endpoint_out_of_range_ip(self):
+        """Test that /api/install rejects IPv4 addresses with out-of-range octets."""
+        response = self.client.post('/api/install',
+                                    json={
+                                        'script_name': 'test-script',
+                                        'server_ip': '999.999.999.999',
+                                        'server_root_password': 'password'
+                                    })
+        self.assertEqual(response.status_code, 400)
+        data = response.get_json()
+        self.assertIn('Invalid server_ip format', data['error'])
+
     def test_install_endpoint_valid_script_name_formats(self):
         """Test that script_name validation accepts valid formats."""
         # These should all pass validation and return a task_id
-        valid_names = ['test', 'test-script', 'test_script', 'script123']
-        for name in valid_names:
-            response = self.client.post('/api/install',
-                                        data=json.dumps({
-                                            'script_name': name,
-                                            'server_ip': '192.168.1.1',
-                                            'server_root_password': 'password'
-                                        }),
-                                        content_type='application/json')
-            # Should not be 400 for script_name validation
-            data = response.get_json()
-            if response.status_code == 400:
-                self.assertNotIn('Invalid script_name format', data.get('error', ''))
+        for name in ('test', 'test-script', 'test_script', 'script123'):
+            with self.subTest(script_name=name):
+                response = self.client.post('/api/install',
+                                            json={
+                                                'script_name': name,
+                                                'server_ip': '192.168.1.1',
+                                                'server_root_password': 'password'
+                                            })
+                # Should not be 400 for script_name validation
+                data = response.get_json()
+                if response.status_code == 400:
+                    self.assertNotIn('Invalid script_name format', data.get('error', ''))
 
     def test_install_endpoint_returns_task_id(self):
         """Test that /api/install returns a task_id for valid requests."""
+        started = threading.Event()
+        self.mock_execute.side_effect = lambda *args: started.set()
         response = self.client.post('/api/install',
-                                    data=json.dumps({
+                                    json={
                                         'script_name': 'test-script',
                                         'server_ip': '192.168.1.1',
                                         'server_root_password': 'password'
-                                    }),
-                                    content_type='application/json')
+                                    })
         self.assertEqual(response.status_code, 200)
         data = response.get_json()
         self.assertTrue(data['success'])
         self.assertIn('task_id', data)
         self.assertIsNotNone(data['task_id'])
-        # Verify task_id is a valid MD5 hash (32 hex characters)
+        # Verify task_id is a valid hash (32 hex characters)
         self.assertRegex(data['task_id'], r'^[a-f0-9]{32}$')
+        # The installation was handed to the background executor
+        self.assertTrue(started.wait(5))
+        self.assertEqual(self.mock_execute.call_args[0][0], data['task_id'])
+
+    def test_install_endpoint_queue_full(self):
+        """Test that /api/install returns 503 when the installation queue is full."""
+        with patch('app._install_slots', threading.BoundedSemaphore(1)) as slots, \
+                patch('app.rate_limiter.enabled', False):
+            slots.acquire()
+            response = self.client.post('/api/install',
+                                        json={
+                                            'script_name': 'test-script',
+                                            'server_ip': '192.168.1.1',
+                                            'server_root_password': 'password'
+                                        })
+        self.assertEqual(response.status_code, 503)
+        data = response.get_json()
+        self.assertFalse(data['success'])
+        self.assertIn('busy', data['error'])
+        self.assertIsNone(data['task_id'])
+
+    def test_install_endpoint_releases_acquired_slot(self):
+        """Test that a finished task releases the semaphore it acquired, even if it was replaced."""
+        release = threading.Event()
+        self.mock_execute.side_effect = lambda *args: release.wait(5)
+        acquired = threading.BoundedSemaphore(1)
+        with patch('app._install_slots', acquired), patch('app.rate_limiter.enabled', False):
+            response = self.client.post('/api/install',
+                                        json={
+                                            'script_name': 'test-script',
+                                            'server_ip': '192.168.1.1',
+                                            'server_root_password': 'password'
+                                        })
+            self.assertEqual(response.status_code, 200)
+        self.assertFalse(acquired.acquire(blocking=False))
+
+        # The task finishes after the global semaphore was replaced again
+        release.set()
+        self.assertTrue(acquired.acquire(timeout=5))
+
+    def test_install_endpoint_releases_slot_on_error(self):
+        """Test that the queue slot is released when the task file cannot be written."""
+        with patch('app._install_slots', threading.BoundedSemaphore(1)) as slots, \
+                patch('app.rate_limiter.enabled', False), \
+                patch('app.write_task_status', side_effect=OSError('No space left on device')):
+            response = self.client.post('/api/install',
+                                        json={
+                                            'script_name': 'test-script',
+                                            'server_ip': '192.168.1.1',
+                                            'server_root_password': 'password'
+                                        })
+            self.assertEqual(response.status_code, 500)
+            self.assertTrue(slots.acquire(blocking=False))
+        self.mock_execute.assert_not_called()
+
+    def test_install_endpoint_uses_proxy_client_ip(self):
+        """Test that rate limiting uses the client IP added by the trusted proxy."""
+        with patch('app.rate_limiter.enabled', True), \
+                patch('app.rate_limiter.record_request', return_value=(False, 11, 'Rate limit exceeded')) as record:
+            response = self.client.post('/api/install',
+                                        json={},
+                                        headers={'X-Forwarded-For': '1.2.3.4, 10.0.0.5'})
+        self.assertEqual(response.status_code, 429)
+        # The first entry was supplied by the client and is not trusted
+        self.assertEqual(response.get_json()['ip'], '10.0.0.5')
+        self.assertEqual(record.call_args[0][0], '10.0.0.5')
 
     def test_install_endpoint_same_params_same_task_id(self):
-        """Test that the same parameters generate the same task_id."""
+        """Test that the task_id is derived from the request parameters."""
         params = {
             'script_name': 'test-script',
             'server_ip': '192.168.1.1',
@@ -313,26 +738,101 @@ class TestInstallEndpoint(unittest.TestCase):
             'additional': 'extra'
         }
 
-        response1 = self.client.post('/api/install',
-                                     data=json.dumps(params),
-                                     content_type='application/json')
-        data1 = response1.get_json()
+        response = self.client.post('/api/install', json=params)
+
+        self.assertEqual(
+            response.get_json()['task_id'],
+            generate_task_id(params['script_name'], params['server_ip'],
+                             params['server_root_password'], params['additional'])
+        )
+
+
+class FakeChannel:
+    """Minimal stand-in for paramiko.Channel with buffered stdout/stderr."""
+
+    def __init__(self, stdout=b'', stderr=b'', exit_status=0):
+        self._stdout = stdout
+        self._stderr = stderr
+        self._exit_status = exit_status
+        self.eof_received = True
+        self.closed = False
+        self.write_shut_down = False
 
-        # Clear the task file to allow another request with same params
-        if data1.get('task_id'):
-            delete_task_file(data1['task_id'])
+    def recv_ready(self):
+        return bool(self._stdout)
 
-        response2 = self.client.post('/api/install',
-                                     data=json.dumps(params),
-                                     content_type='application/json')
-        data2 = response2.get_json()
+    def recv(self, nbytes):
+        data, self._stdout = self._stdout[:nbytes], self._stdout[nbytes:]
+        return data
 
-        self.assertEqual(data1['task_id'], data2['task_id'])
+    def recv_stderr_ready(self):
+        return bool(self._stderr)
+
+    def recv_stderr(self, nbytes):
+        data, self._stderr = self._stderr[:nbytes], self._stderr[nbytes:]
+        return data
+
+    def exit_status_ready(self):
+        return True
+
+    def recv_exit_status(self):
+        return self._exit_status
+
+    def set_combine_stderr(self, combine):
+        self.combine_stderr = combine
+
+    def shutdown_write(self):
+        self.write_shut_down = True
+
+
+class LateOutputChannel(FakeChannel):
+    """FakeChannel whose exit status arrives before the last output chunks."""
+
+    def __init__(self, chunks, exit_status=0):
+        super().__init__(exit_status=exit_status)
+        self._chunks = list(chunks)
+        self.eof_received = False
+
+    def deliver_next_chunk(self, *args):
+        """Stand-in for select.select(): the next chunk arrives, then EOF."""
+        stdout, stderr = self._chunks.pop(0)
+        self._stdout += stdout
+        self._stderr += stderr
+        self.eof_received = not self._chunks
+        return [self], [], []
+
+
+class FakeStdin:
+    """Minimal stand-in for the stdin file returned by exec_command()."""
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.written = b''
+
+    def write(self, data):
+        self.written += data
+
+    def flush(self):
+        pass
+
+
+def make_exec_result(stdout=b'', stderr=b'', exit_status=0):
+    """Build an exec_command() return value backed by a FakeChannel."""
+    channel = FakeChannel(stdout, stderr, exit_status)
+    return FakeStdin(channel), SimpleNamespace(channel=channel), SimpleNamespace(channel=channel)
 
 
 class TestExecuteScriptViaSSH(unittest.TestCase):
     """Test cases for the execute_script_via_ssh function."""
 
+    def setUp(self):
+        """Start each test with an empty SSH connection pool."""
+        close_ssh_pool()
+
+    def tearDown(self):
+        """Close any SSH connections pooled during the test."""
+        close_ssh_pool()
+
     @unittest.skipIf(not SSH_AVAILABLE, "paramiko not installed")
     @patch('app.paramiko.SSHClient')
     def test_execute_script_success(self, mock_ssh_class):
@@ -340,14 +840,7 @@ class TestExecuteScriptViaSSH(unittest.TestCase):
         mock_ssh = MagicMock()
         mock_ssh_class.return_value = mock_ssh
 
-        mock_stdout = MagicMock()
-        mock_stdout.read.return_value = b'Success'
-        mock_stdout.channel.recv_exit_status.return_value = 0
-
-        mock_stderr = MagicMock()
-        mock_stderr.read.return_value = b''
-
-        mock_ssh.exec_command.return_value = (MagicMock(), mock_stdout, mock_stderr)
+        mock_ssh.exec_command.return_value = make_exec_result(stdout=b'Success')
 
         success, output, error = execute_script_via_ssh(
             server_ip='192.168.1.1',
@@ -366,14 +859,7 @@ class TestExecuteScriptViaSSH(unittest.TestCase):
         mock_ssh = MagicMock()
         mock_ssh_class.return_value = mock_ssh
 
-        mock_stdout = MagicMock()
-        mock_stdout.read.return_value = b'Done'
-        mock_stdout.channel.recv_exit_status.return_value = 0
-
-        mock_stderr = MagicMock()
-        mock_stderr.read.return_value = b''
-
-        mock_ssh.exec_command.return_value = (MagicMock(), mock_stdout, mock_stderr)
+        mock_ssh.exec_command.return_value = make_exec_result(stdout=b'Done')
 
         success, output, error = execute_script_via_ssh(
             server_ip='192.168.1.1',
@@ -388,6 +874,202 @@ class TestExecuteScriptViaSSH(unittest.TestCase):
         call_args = mock_ssh.exec_command.call_args[0][0]
         self.assertIn('example.com', call_args)
 
+    @unittest.skipIf(not SSH_AVAILABLE, "paramiko not installed")
+    @patch('app.paramiko.SSHClient')
+    def test_execute_script_reuses_pooled_connection(self, mock_ssh_class):
+        """Test that a second execution on the same server reuses the SSH connection."""
+        mock_ssh = MagicMock()
+        mock_ssh_class.return_value = mock_ssh
+
+        mock_ssh.exec_command.side_effect = lambda *args, **kwargs: make_exec_result(stdout=b'Done')
+
+        for _ in range(2):
+            success, _, _ = execute_script_via_ssh(
+                server_ip='192.168.1.1',
+                server_root_password='password',
+                script_name='test-script'
+            )
+            self.assertTrue(success)
+
+        mock_ssh.connect.assert_called_once()
+        self.assertEqual(mock_ssh.exec_command.call_count, 2)
+        mock_ssh.close.assert_not_called()
+
+    @unittest.skipIf(not SSH_AVAILABLE, "paramiko not installed")
+    @patch('app.paramiko.SSHClient')
+    def test_execute_script_separate_stderr(self, mock_ssh_class):
+        """Test that stderr is read separately and appended to the output."""
+        mock_ssh = MagicMock()
+        mock_ssh_class.return_value = mock_ssh
+        mock_ssh.exec_command.return_value = make_exec_result(
+            stdout=b'Output', stderr=b'Warning', exit_status=1
+        )
+
+        success, output, error = execute_script_via_ssh(
+            server_ip='192.168.1.1',
+            server_root_password='password',
+            script_name='test-script'
+        )
+
+        self.assertFalse(success)
+        self.assertEqual(output, 'Output\nWarning')
+        self.assertIn('status 1', error)
+        self.assertNotIn('get_pty', mock_ssh.exec_command.call_args.kwargs)
+
+    @unittest.skipIf(not SSH_AVAILABLE, "paramiko not installed")
+    @patch('app.paramiko.SSHClient')
+    def test_execute_script_reads_output_after_exit_status(self, mock_ssh_class):
+        """Test that output arriving after the exit status is not lost."""
+        mock_ssh = MagicMock()
+        mock_ssh_class.return_value = mock_ssh
+        channel = LateOutputChannel([(b'Installing...', b''), (b'', b'Error: disk full')], exit_status=1)
+        mock_ssh.exec_command.return_value = (
+            FakeStdin(channel), SimpleNamespace(channel=channel), SimpleNamespace(channel=channel)
+        )
+
+        with patch('app.select.select', side_effect=channel.deliver_next_chunk):
+            success, output, error = execute_script_via_ssh(
+                server_ip='192.168.1.1',
+                server_root_password='password',
+                script_name='test-script'
+            )
+
+        self.assertFalse(success)
+        self.assertEqual(output, 'Installing...\nError: disk full')
+        self.assertIn('status 1', error)
+
+    @unittest.skipIf(not SSH_AVAILABLE, "paramiko not installed")
+    @patch('app.paramiko.SSHClient')
+    def test_execute_script_connection_timeouts_and_keepalive(self, mock_ssh_class):
+        """Test that connections use short phase timeouts and enable keepalive."""
+        mock_ssh = MagicMock()
+        mock_ssh_class.return_value = mock_ssh
+        mock_ssh.exec_command.return_value = make_exec_result(stdout=b'Done')
+
+        execute_script_via_ssh(
+            server_ip='192.168.1.1',
+            server_root_password='password',
+            script_name='test-script'
+        )
+
+        connect_kwargs = mock_ssh.connect.call_args.kwargs
+        self.assertIn('banner_timeout', connect_kwargs)
+        self.assertIn('auth_timeout', connect_kwargs)
+        mock_ssh.get_transport.return_value.set_keepalive.assert_called_once()
+
+    @unittest.skipIf(not SSH_AVAILABLE, "paramiko not installed")
+    @patch('app.paramiko.SSHClient')
+    def test_execute_script_async_streams_output_to_task_file(self, mock_ssh_class):
+        """Test that background execution writes the output and final status to the task file."""
+        mock_ssh = MagicMock()
+        mock_ssh_class.return_value = mock_ssh
+        mock_ssh.exec_command.return_value = make_exec_result(stdout=b'\x1b[32mStep 1\x1b[0m\nStep 2\n')
+
+        task_id = generate_task_id('test-script', '192.168.1.1', 'password')
+        write_task_status(task_id, TASK_STATUS_PROCESSING, 'Starting...\n')
+        try:
+            execute_script_via_ssh_async(task_id, '192.168.1.1', 'password', 'test-script')
+            status, content = read_task_status(task_id)
+        finally:
+            delete_task_file(task_id)
+
+        self.assertEqual(status, TASK_STATUS_COMPLETED)
+        self.assertTrue(content.startswith('Starting...\n'))
+        self.assertTrue(content.endswith('Step 1\nStep 2\n'))
+
+    @unittest.skipIf(not SSH_AVAILABLE, "paramiko not installed")
+    @patch('app.append_task_content')
+    @patch('app.paramiko.SSHClient')
+    def test_execute_script_async_report_removed(self, mock_ssh_class, mock_append):
+        """Test that a report removed while the task runs is not recreated without its status line."""
+        mock_ssh = MagicMock()
+        mock_ssh_class.return_value = mock_ssh
+        mock_ssh.exec_command.return_value = make_exec_result(stdout=b'Step 1\n' * 20, exit_status=1)
+
+        task_id = generate_task_id('test-script', '192.168.1.1', 'password')
+        delete_task_file(task_id)
+        try:
+            execute_script_via_ssh_async(task_id, '192.168.1.1', 'password', 'test-script')
+            status, content = read_task_status(task_id)
+        finally:
+            delete_task_file(task_id)
+
+        self.assertEqual(status, TASK_STATUS_ERROR)
+        self.assertEqual(content, '\nScript exited with status 1')
+
+    @unittest.skipIf(not SSH_AVAILABLE, "paramiko not installed")
+    @patch('app.SCRIPTS_UPLOAD', True)
+    @patch('app.paramiko.SSHClient')
+    def test_execute_script_sends_local_script(self, mock_ssh_class):
+        """Test that with SCRIPTS_UPLOAD a local script is sent over stdin instead of downloaded."""
+        mock_ssh = MagicMock()
+        mock_ssh_class.return_value = mock_ssh
+        stdin, stdout, stderr = make_exec_result(stdout=b'Done')
+        mock_ssh.exec_command.return_value = (stdin, stdout, stderr)
+
+        with open(os.path.join(SCRIPTS_DIR, 'n8n.sh'), 'rb') as f:
+            script_body = f.read()
+
+        success, _, _ = execute_script_via_ssh(
+            server_ip='192.168.1.1',
+            server_root_password='password',
+            script_name='n8n',
+            additional='example.com'
+        )
+
+        self.assertTrue(success)
+        self.assertEqual(mock_ssh.exec_command.call_args[0][0], "bash -s -- example.com")
+        self.assertEqual(stdin.written, script_body)
+        self.assertTrue(stdin.channel.write_shut_down)
+
+    @unittest.skipIf(not SSH_AVAILABLE, "paramiko not installed")
+    @patch('app.SCRIPTS_UPLOAD', True)
+    @patch('app.paramiko.SSHClient')
+    def test_execute_script_downloads_missing_local_script(self, mock_ssh_class):
+        """Test that scripts missing from SCRIPTS_DIR are still downloaded on the server."""
+        mock_ssh = MagicMock()
+        mock_ssh_class.return_value = mock_ssh
+        mock_ssh.exec_command.return_value = make_exec_result(stdout=b'Done')
+
+        execute_script_via_ssh(
+            server_ip='192.168.1.1',
+            server_root_password='password',
+            script_name='no-such-script'
+        )
+
+        self.assertIn('curl', mock_ssh.exec_command.call_args[0][0])
+
+    def test_load_local_script_returns_digest(self):
+        """Test that local scripts are returned together with their SHA-256 digest."""
+        with open(os.path.join(SCRIPTS_DIR, 'n8n.sh'), 'rb') as f:
+            script_body = f.read()
+
+        self.assertEqual(
+            load_local_script('n8n'),
+            (script_body, hashlib.sha256(script_body).hexdigest())
+        )
+        self.assertEqual(load_local_script('no-such-script'), (None, None))
+
+    def test_task_report_stream_joins_split_chunks(self):
+        """Test that escape sequences and UTF-8 characters split between chunks are handled."""
+        report_file = io.BytesIO()
+        stream = TaskReportStream(report_file)
+        stream.write(b'Done \x1b[3')
+        self.assertEqual(report_file.getvalue(), b'Done ')
+        stream.write(b'2m\xd0')
+        stream.write(b'\x9f\x1b[0m\x00\n')
+        stream.flush()
+        self.assertEqual(report_file.getvalue().decode('utf-8'), 'Done \u041f\n')
+
+    def test_bounded_output_buffer_truncates_output(self):
+        """Test that BoundedOutputBuffer keeps only the tail of long output."""
+        buffer = BoundedOutputBuffer(max_bytes=10)
+        buffer.append(b'a' * 8)
+        buffer.append(b'b' * 8)
+        output = buffer.getvalue()
+        self.assertTrue(output.startswith('[... output truncated ...]'))
+        self.assertTrue(output.endswith('aa' + 'b' * 8))
+
     @unittest.skipIf(not SSH_AVAILABLE, "paramiko not installed")
     @patch('app.paramiko.SSHClient')
     def test_execute_script_connection_timeout(self, mock_ssh_class):
@@ -410,11 +1092,12 @@ class TestExecuteScriptViaSSH(unittest.TestCase):
 class TestIndexEndpointWithInstall(unittest.TestCase):
     """Test that index endpoint includes install route."""
 
-    def setUp(self):
-        """Set up test client."""
-        self.app = app
-        self.app.config['TESTING'] = True
-        self.client = self.app.test_client()
+    @classmethod
+    def setUpClass(cls):
+        """Set up a test client shared by the tests of the class."""
+        cls.app = app
+        cls.app.config['TESTING'] = True
+        cls.client = cls.app.test_client()
 
     def test_index_includes_install_endpoint(self):
         """Test that the root endpoint lists the /api/install endpoint."""
@@ -441,9 +1124,7 @@ class TestTaskHelperFunctions(unittest.TestCase):
 
     def tearDown(self):
         """Clean up test task files."""
-        task_file = get_task_file_path(self.test_task_id)
-        if os.path.exists(task_file):
-            os.remove(task_file)
+        delete_task_file(self.test_task_id)
 
     def test_generate_task_id_consistency(self):
         """Test that generate_task_id produces consistent results."""
@@ -458,7 +1139,7 @@ class TestTaskHelperFunctions(unittest.TestCase):
         self.assertNotEqual(task_id1, task_id2)
 
     def test_generate_task_id_format(self):
-        """Test that task ID is a valid MD5 hash format."""
+        """Test that task ID is a 32-character hex hash."""
         task_id = generate_task_id('script', '192.168.1.1', 'password', 'extra')
         self.assertRegex(task_id, r'^[a-f0-9]{32}$')
 
@@ -468,6 +1149,32 @@ class TestTaskHelperFunctions(unittest.TestCase):
         self.assertTrue(path.endswith('abc123.txt'))
         self.assertIn(TASKS_DIR, path)
 
+    def test_cleanup_old_task_files(self):
+        """Test that only task files older than the maximum age are deleted."""
+        write_task_status(self.test_task_id, TASK_STATUS_COMPLETED, 'Old report')
+        old_time = time.time() - 3600
+        os.utime(get_task_file_path(self.test_task_id), (old_time, old_time))
+
+        self.assertEqual(cleanup_old_task_files(max_age_seconds=1800), 1)
+        self.assertFalse(os.path.exists(get_task_file_path(self.test_task_id)))
+
+        write_task_status(self.test_task_id, TASK_STATUS_COMPLETED, 'New report')
+        self.assertEqual(cleanup_old_task_files(max_age_seconds=1800), 0)
+        self.assertTrue(os.path.exists(get_task_file_path(self.test_task_id)))
+
+    def test_finish_task_keeps_content(self):
+        """Test that finishing a task updates the status and appends the message."""
+        write_task_status(self.test_task_id, TASK_STATUS_PROCESSING, 'Line 1\n')
+        append_task_content(self.test_task_id, 'Line 2\n')
+        finish_task(self.test_task_id, TASK_STATUS_ERROR, '\nScript exited with status 1')
+        status, content = read_task_status(self.test_task_id)
+        self.assertEqual(status, TASK_STATUS_ERROR)
+        self.assertEqual(content, 'Line 1\nLine 2\n\nScript exited with status 1')
+
+        finish_task(self.test_task_id, TASK_STATUS_COMPLETED)
+        status, _ = read_task_status(self.test_task_id)
+        self.assertEqual(status, TASK_STATUS_COMPLETED)
+
     def test_write_and_read_task_status(self):
         """Test writing and reading task status."""
         write_task_status(self.test_task_id, TASK_STATUS_PROCESSING, 'Test content')
@@ -499,19 +1206,21 @@ class TestTaskHelperFunctions(unittest.TestCase):
 class TestStatusEndpoint(unittest.TestCase):
     """Test cases for the /api/status/<task_id> endpoint."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Set up a test client shared by the tests of the class."""
+        cls.app = app
+        cls.app.config['TESTING'] = True
+        cls.client = cls.app.test_client()
+
     def setUp(self):
-        """Set up test client."""
-        self.app = app
-        self.app.config['TESTING'] = True
-        self.client = self.app.test_client()
+        """Ensure tasks directory exists."""
         os.makedirs(TASKS_DIR, exist_ok=True)
         self.test_task_id = 'a1b2c3d4e5f6a1b2c3d4e5f6a1b2c3d4'
 
     def tearDown(self):
         """Clean up test task files."""
-        task_file = get_task_file_path(self.test_task_id)
-        if os.path.exists(task_file):
-            os.remove(task_file)
+        delete_task_file(self.test_task_id)
 
     def test_status_endpoint_invalid_task_id_format(self):
         """Test that /api/status returns 400 for invalid task_id format."""
@@ -521,6 +1230,12 @@ class TestStatusEndpoint(unittest.TestCase):
         self.assertFalse(data['success'])
         self.assertIn('Invalid task_id format', data['error'])
 
+    def test_status_endpoint_task_id_trailing_newline(self):
+        """Test that /api/status rejects a task_id followed by a newline."""
+        response = self.client.get('/api/status/a1b2c3d4e5f6a1b2c3d4e5f6a1b2c3d4%0A')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Invalid task_id format', response.get_json()['error'])
+
     def test_status_endpoint_task_not_found(self):
         """Test that /api/status returns 404 for non-existent task."""
         response = self.client.get('/api/status/a1b2c3d4e5f6a1b2c3d4e5f6a1b2c3d4')
@@ -568,6 +1283,38 @@ class TestStatusEndpoint(unittest.TestCase):
         # Task file should be deleted after error status is retrieved
         self.assertFalse(os.path.exists(get_task_file_path(self.test_task_id)))
 
+    def test_status_endpoint_streams_long_content(self):
+        """Test that long report content is streamed as a valid JSON body."""
+        content = 'Line with "quotes", \\ and \u041f\u0440\u0438\u0432\u0435\u0442\n' * 5000
+        write_task_status(self.test_task_id, TASK_STATUS_COMPLETED, content)
+
+        response = self.client.get(f'/api/status/{self.test_task_id}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/json')
+        self.assertEqual(response.get_data(), serialize_json({
+            'success': True,
+            'status': TASK_STATUS_COMPLETED,
+            'result': content
+        }))
+
+    def test_status_endpoint_closes_report_without_reading_body(self):
+        """Test that the report is closed when the response is closed before its body is read."""
+        write_task_status(self.test_task_id, TASK_STATUS_PROCESSING, 'Working...')
+        opened = []
+
+        def open_report(task_id):
+            status, report_file = open_task_report(task_id)
+            opened.append(report_file)
+            return status, report_file
+
+        with patch('app.open_task_report', side_effect=open_report):
+            for method in ('GET', 'HEAD'):
+                with self.subTest(method=method):
+                    response = self.client.open(f'/api/status/{self.test_task_id}',
+                                                method=method, buffered=False)
+                    response.close()
+                    self.assertTrue(opened[-1].closed)
+
     def test_status_endpoint_second_request_returns_not_found(self):
         """Test that second request for completed task returns not found."""
         write_task_status(self.test_task_id, TASK_STATUS_COMPLETED, 'Done')
@@ -586,157 +1333,95 @@ class TestStatusEndpoint(unittest.TestCase):
 class TestStripAnsiCodes(unittest.TestCase):
     """Test cases for the strip_ansi_codes function."""
 
-    def test_strip_basic_colors(self):
-        """Test stripping basic color codes."""
-        self.assertEqual(strip_ansi_codes("\033[31mRed text\033[0m"), "Red text")
-        self.assertEqual(strip_ansi_codes("\033[32mGreen text\033[0m"), "Green text")
-        self.assertEqual(strip_ansi_codes("\033[1;34mBold blue\033[0m"), "Bold blue")
-
-    def test_strip_extended_colors(self):
-        """Test stripping extended color codes."""
-        self.assertEqual(strip_ansi_codes("\033[38;5;196mExtended color\033[0m"), "Extended color")
-        self.assertEqual(strip_ansi_codes("\033[48;2;255;0;0mTrue color bg\033[0m"), "True color bg")
-
-    def test_strip_multiple_colors(self):
-        """Test stripping multiple color codes in one line."""
-        self.assertEqual(
-            strip_ansi_codes("\033[31mRed\033[0m and \033[32mGreen\033[0m"),
-            "Red and Green"
-        )
-
-    def test_strip_common_script_output(self):
-        """Test stripping colors from common script output patterns."""
-        self.assertEqual(
-            strip_ansi_codes("[ \033[32mOK\033[0m ] Service started"),
-            "[ OK ] Service started"
-        )
-        self.assertEqual(
-            strip_ansi_codes("[\033[31mFAIL\033[0m] Service failed"),
-            "[FAIL] Service failed"
-        )
-
-    def test_strip_cursor_movement_codes(self):
-        """Test stripping cursor movement codes."""
-        self.assertEqual(strip_ansi_codes("\033[2J\033[H"), "")  # Clear screen
-        self.assertEqual(strip_ansi_codes("Line 1\033[A"), "Line 1")  # Cursor up
-
-    def test_strip_erase_line_codes(self):
-        """Test stripping erase line codes."""
-        self.assertEqual(strip_ansi_codes("Progress: \033[K50%"), "Progress: 50%")
-
-    def test_strip_only_escape_sequences(self):
-        """Test that lines with only escape sequences become empty."""
-        self.assertEqual(strip_ansi_codes("\033[0m\033[K"), "")
-
-    def test_preserve_empty_string(self):
-        """Test that empty strings are handled correctly."""
-        self.assertEqual(strip_ansi_codes(""), "")
-
-    def test_preserve_none(self):
-        """Test that None is handled correctly."""
-        self.assertIsNone(strip_ansi_codes(None))
-
-    def test_preserve_plain_text(self):
-        """Test that plain text without escape codes is preserved."""
-        self.assertEqual(
-            strip_ansi_codes("Plain text without escape codes"),
-            "Plain text without escape codes"
-        )
-
-    def test_preserve_newlines(self):
-        """Test that newlines are preserved."""
-        self.assertEqual(
-            strip_ansi_codes("Line 1\nLine 2\n\033[32mLine 3\033[0m\n"),
-            "Line 1\nLine 2\nLine 3\n"
-        )
-
-    def test_strip_hex_escape_format(self):
-        """Test stripping hex escape character format."""
-        self.assertEqual(strip_ansi_codes("\x1b[31mRed\x1b[0m"), "Red")
-
-    def test_strip_text_formatting(self):
-        """Test stripping bold, italic, underline codes."""
-        self.assertEqual(strip_ansi_codes("\033[1mBold\033[0m"), "Bold")
-        self.assertEqual(strip_ansi_codes("\033[3mItalic\033[0m"), "Italic")
-        self.assertEqual(strip_ansi_codes("\033[4mUnderline\033[0m"), "Underline")
-
-    def test_strip_combined_attributes(self):
-        """Test stripping combined formatting attributes."""
-        self.assertEqual(
-            strip_ansi_codes("\033[1;4;31mBold underline red\033[0m"),
-            "Bold underline red"
-        )
-
-    def test_strip_null_characters(self):
-        """Test stripping NULL characters (\\x00)."""
-        self.assertEqual(strip_ansi_codes("Hello\x00World"), "HelloWorld")
-        self.assertEqual(strip_ansi_codes("\x00\x00\x00Text\x00\x00"), "Text")
-        # Many NULL characters as seen in real terminal output
-        self.assertEqual(
-            strip_ansi_codes("Before\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00After"),
-            "BeforeAfter"
-        )
-
-    def test_strip_other_control_characters(self):
-        """Test stripping other non-printable control characters."""
-        # Bell character (\\x07) - note: BEL is stripped as part of control chars
-        self.assertEqual(strip_ansi_codes("Text\x07here"), "Texthere")
-        # Backspace (\\x08)
-        self.assertEqual(strip_ansi_codes("Text\x08here"), "Texthere")
-        # Vertical tab (\\x0b)
-        self.assertEqual(strip_ansi_codes("Text\x0bhere"), "Texthere")
-        # Form feed (\\x0c)
-        self.assertEqual(strip_ansi_codes("Text\x0chere"), "Texthere")
-        # Delete (\\x7f)
-        self.assertEqual(strip_ansi_codes("Text\x7fhere"), "Texthere")
-
-    def test_preserve_tabs_and_newlines(self):
-        """Test that tabs (\\x09) and newlines (\\x0a) are preserved."""
-        self.assertEqual(strip_ansi_codes("Line1\nLine2"), "Line1\nLine2")
-        self.assertEqual(strip_ansi_codes("Col1\tCol2"), "Col1\tCol2")
-        self.assertEqual(strip_ansi_codes("Line1\r\nLine2"), "Line1\r\nLine2")
-
-    def test_strip_mixed_ansi_and_control_chars(self):
-        """Test stripping mixed ANSI codes and control characters."""
-        input_text = "\x1b[32mGreen\x1b[0m\x00\x00\x00Text\x1b[H\x1b[J"
-        expected = "GreenText"
-        self.assertEqual(strip_ansi_codes(input_text), expected)
-
-    def test_strip_complex_terminal_output(self):
-        """Test stripping complex terminal output similar to real-world data."""
-        # Simulating output like in the issue
-        input_text = (
-            "Starting installation...\n"
-            "\x1b[0;36m╔═══════════════════════════╗\x1b[0m\n"
-            "\x1b[0;36m║\x1b[0m  \x1b[1;37mDomain Config\x1b[0m\n"
-            "\x1b[H\x1b[J"  # Screen clear
-            "\x00\x00\x00\x00\x00\x00\x00\x00"  # NULL characters
-            "\x1b[0;32m✔\x1b[0m Done\n"
-        )
-        expected = (
-            "Starting installation...\n"
-            "╔═══════════════════════════╗\n"
-            "║  Domain Config\n"
-            "✔ Done\n"
-        )
-        self.assertEqual(strip_ansi_codes(input_text), expected)
+    def test_strip_does_not_compile_patterns(self):
+        """Test that stripping uses the patterns compiled at import time."""
+        with patch('re.compile', side_effect=AssertionError('pattern compiled per call')):
+            self.assertEqual(strip_ansi_codes("\033[31mRed\033[0m\x00"), "Red")
+            self.assertEqual(strip_ansi_bytes(b"\033[31mRed\033[0m\x00"), b"Red")
+
+    # (description, input, expected output)
+    CASES = [
+        ('basic colors', "\033[31mRed text\033[0m", "Red text"),
+        ('basic colors', "\033[32mGreen text\033[0m", "Green text"),
+        ('basic colors', "\033[1;34mBold blue\033[0m", "Bold blue"),
+        ('256 colors', "\033[38;5;196mExtended color\033[0m", "Extended color"),
+        ('true color background', "\033[48;2;255;0;0mTrue color bg\033[0m", "True color bg"),
+        ('multiple colors', "\033[31mRed\033[0m and \033[32mGreen\033[0m", "Red and Green"),
+        ('script output', "[ \033[32mOK\033[0m ] Service started", "[ OK ] Service started"),
+        ('script output', "[\033[31mFAIL\033[0m] Service failed", "[FAIL] Service failed"),
+        ('clear screen', "\033[2J\033[H", ""),
+        ('cursor up', "Line 1\033[A", "Line 1"),
+        ('erase line', "Progress: \033[K50%", "Progress: 50%"),
+        ('only escape sequences', "\033[0m\033[K", ""),
+        ('empty string', "", ""),
+        ('None', None, None),
+        ('plain text', "Plain text without escape codes", "Plain text without escape codes"),
+        ('newlines', "Line 1\nLine 2\n\033[32mLine 3\033[0m\n", "Line 1\nLine 2\nLine 3\n"),
+        ('hex escape', "\x1b[31mRed\x1b[0m", "Red"),
+        ('bold', "\033[1mBold\033[0m", "Bold"),
+        ('italic', "\033[3mItalic\033[0m", "Italic"),
+        ('underline', "\033[4mUnderline\033[0m", "Underline"),
+        ('combined attributes', "\033[1;4;31mBold underline red\033[0m", "Bold underline red"),
+        ('NUL', "Hello\x00World", "HelloWorld"),
+        ('NUL', "\x00\x00\x00Text\x00\x00", "Text"),
+        ('NUL run', "Before" + "\x00" * 10 + "After", "BeforeAfter"),
+        ('bell', "Text\x07here", "Texthere"),
+        ('backspace', "Text\x08here", "Texthere"),
+        ('vertical tab', "Text\x0bhere", "Texthere"),
+        ('form feed', "Text\x0chere", "Texthere"),
+        ('delete', "Text\x7fhere", "Texthere"),
+        ('newline preserved', "Line1\nLine2", "Line1\nLine2"),
+        ('tab preserved', "Col1\tCol2", "Col1\tCol2"),
+        ('CRLF preserved', "Line1\r\nLine2", "Line1\r\nLine2"),
+        ('ANSI and control characters', "\x1b[32mGreen\x1b[0m\x00\x00\x00Text\x1b[H\x1b[J", "GreenText"),
+        ('real-world output',
+         "Starting installation...\n"
+         "\x1b[0;36m╔═══════════════════════════╗\x1b[0m\n"
+         "\x1b[0;36m║\x1b[0m  \x1b[1;37mDomain Config\x1b[0m\n"
+         "\x1b[H\x1b[J"
+         "\x00\x00\x00\x00\x00\x00\x00\x00"
+         "\x1b[0;32m✔\x1b[0m Done\n",
+         "Starting installation...\n"
+         "╔═══════════════════════════╗\n"
+         "║  Domain Config\n"
+         "✔ Done\n"),
+    ]
+
+    def test_strip_cases(self):
+        """Test that escape codes and control characters are stripped and text is preserved."""
+        for description, text, expected in self.CASES:
+            with self.subTest(description, text=text):
+                self.assertEqual(strip_ansi_codes(text), expected)
+
+    def test_strip_ansi_bytes_matches_text_version(self):
+        """Test that strip_ansi_bytes cleans raw UTF-8 output like strip_ansi_codes."""
+        for description, text, expected in self.CASES:
+            if text is None:
+                continue
+            with self.subTest(description, text=text):
+                self.assertEqual(strip_ansi_bytes(text.encode('utf-8')), expected.encode('utf-8'))
 
 
 class TestAnsiStrippingIntegration(unittest.TestCase):
     """Test ANSI code stripping integration with task functions."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Set up a test client shared by the tests of the class."""
+        cls.app = app
+        cls.app.config['TESTING'] = True
+        cls.client = cls.app.test_client()
+
     def setUp(self):
         """Set up test environment."""
         os.makedirs(TASKS_DIR, exist_ok=True)
-        # Use a valid MD5 hash format (32 hex characters) for task_id
+        # Use a valid hash format (32 hex characters) for task_id
         # Using a different task_id than TestStatusEndpoint to avoid conflicts
         self.test_task_id = 'b2c3d4e5f6a1b2c3d4e5f6a1b2c3d4e5'
 
     def tearDown(self):
         """Clean up test task files."""
-        task_file = get_task_file_path(self.test_task_id)
-        if os.path.exists(task_file):
-            os.remove(task_file)
+        delete_task_file(self.test_task_id)
 
     def test_write_task_status_strips_ansi(self):
         """Test that write_task_status strips ANSI codes from content."""
@@ -769,10 +1454,7 @@ class TestAnsiStrippingIntegration(unittest.TestCase):
             f.write(f"STATUS:{TASK_STATUS_COMPLETED}\n")
             f.write("[\033[32mOK\033[0m] Done")
 
-        app.config['TESTING'] = True
-        client = app.test_client()
-
-        response = client.get(f'/api/status/{self.test_task_id}')
+        response = self.client.get(f'/api/status/{self.test_task_id}')
         data = response.get_json()
 
         self.assertTrue(data['success'])
@@ -811,10 +1493,7 @@ class TestAnsiStrippingIntegration(unittest.TestCase):
             f.write(f"STATUS:{TASK_STATUS_COMPLETED}\n")
             f.write("Text\x00\x00\x00with\x00nulls")
 
-        app.config['TESTING'] = True
-        client = app.test_client()
-
-        response = client.get(f'/api/status/{self.test_task_id}')
+        response = self.client.get(f'/api/status/{self.test_task_id}')
         data = response.get_json()
 
         self.assertTrue(data['success'])
@@ -16,6 +16,7 @@ import os
 import sys
 import time
 import tempfile
+import threading
 import unittest
 
 # Add the api directory to the path for imports
@@ -44,6 +45,8 @@ class TestRateLimiter(unittest.TestCase):
 
     def tearDown(self):
         """Clean up test fixtures."""
+        self.limiter.close()
+
         # Remove temporary database file
         if os.path.exists(self.db_path):
             os.unlink(self.db_path)
@@ -164,6 +167,82 @@ class TestRateLimiter(unittest.TestCase):
         stats = self.limiter.get_request_stats(ip_address=test_ip1)
         self.assertEqual(len(stats), 2)
 
+    def test_request_stats_pagination(self):
+        """Test paging through request statistics with the before timestamp."""
+        for _ in range(3):
+            self.limiter.record_request('10.0.0.22')
+
+        first_page = self.limiter.get_request_stats(limit=2)
+        self.assertEqual(len(first_page), 2)
+        self.assertGreaterEqual(first_page[0]['timestamp'], first_page[1]['timestamp'])
+
+        second_page = self.limiter.get_request_stats(limit=2, before=first_page[-1]['timestamp'])
+        self.assertEqual(len(second_page), 1)
+        self.assertLess(second_page[0]['timestamp'], first_page[-1]['timestamp'])
+
+    def test_request_stats_pagination_equal_timestamps(self):
+        """Test that records sharing a timestamp are not skipped at a page boundary."""
+        timestamp = time.time()
+        with self.limiter._get_connection() as conn:
+            conn.executemany(
+                'INSERT INTO request_log (ip_address, endpoint, timestamp) VALUES (?, ?, ?)',
+                [('10.0.0.23', '/api/install', timestamp)] * 3 + [('10.0.0.23', '/api/install', timestamp - 1)]
+            )
+            conn.commit()
+
+        seen = []
+        page = self.limiter.get_request_stats(limit=2)
+        while page:
+            seen.extend(page)
+            page = self.limiter.get_request_stats(
+                limit=2, before=page[-1]['timestamp'], before_id=page[-1]['id']
+            )
+
+        self.assertEqual(len(seen), 4)
+        self.assertEqual(len({record['id'] for record in seen}), 4)
+        self.assertEqual([record['timestamp'] for record in seen], [timestamp] * 3 + [timestamp - 1])
+
+    def test_bulk_blocking(self):
+        """Test blocking and unblocking several IPs at once."""
+        ips = ['10.0.1.1', '10.0.1.2', '10.0.1.3']
+
+        self.assertEqual(self.limiter.block_ips(ips, reason='Threat feed', permanent=True), 3)
+        for ip in ips:
+            is_blocked, reason = self.limiter.is_blocked(ip)
+            self.assertTrue(is_blocked)
+            self.assertEqual(reason, 'Threat feed')
+
+        self.assertEqual(self.limiter.unblock_ips(ips + ['10.0.1.4']), 3)
+        self.assertEqual(self.limiter.get_blocked_ips(), [])
+
+    def test_reblocking_updates_block_in_place(self):
+        """Test that blocking an already blocked IP updates the existing record."""
+        test_ip = '10.0.1.10'
+        self.limiter.block_ip(test_ip, reason='First', duration_hours=1)
+        self.limiter.block_ip(test_ip, reason='Second', permanent=True)
+
+        with self.limiter._get_connection() as conn:
+            rows = conn.execute(
+                'SELECT id, reason, blocked_until, is_permanent FROM blocked_ips WHERE ip_address = ?',
+                (test_ip,)
+            ).fetchall()
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['id'], 1)
+        self.assertEqual(rows[0]['reason'], 'Second')
+        self.assertIsNone(rows[0]['blocked_until'])
+        self.assertEqual(rows[0]['is_permanent'], 1)
+
+    def test_blocked_ip_lookup_uses_unique_index(self):
+        """Test that blocked IP lookups are served by the UNIQUE constraint index."""
+        with self.limiter._get_connection() as conn:
+            plan = conn.execute(
+                'EXPLAIN QUERY PLAN SELECT reason FROM blocked_ips WHERE ip_address = ?',
+                ('10.0.0.1',)
+            ).fetchall()
+            indexes = [row['name'] for row in conn.execute("PRAGMA index_list('blocked_ips')")]
+        self.assertIn('sqlite_autoindex_blocked_ips_1', plan[0]['detail'])
+        self.assertEqual(indexes, ['sqlite_autoindex_blocked_ips_1'])
+
     def test_unblock_nonexistent_ip(self):
         """Test unblocking an IP that was not blocked."""
         result = self.limiter.unblock_ip('192.168.99.99')
@@ -187,6 +266,46 @@ class TestRateLimiter(unittest.TestCase):
         self.assertTrue(allowed)
         self.assertEqual(count, 1)
 
+    def test_old_records_cleaned_up_periodically(self):
+        """Test that record_request removes old records at most once per interval."""
+        def add_old_record():
+            with self.limiter._get_connection() as conn:
+                conn.execute(
+                    'INSERT INTO request_log (ip_address, endpoint, timestamp) VALUES (?, ?, ?)',
+                    ('10.0.0.50', '/api/install', time.time() - 7200)
+                )
+                conn.commit()
+
+        add_old_record()
+        self.limiter.record_request('10.0.0.51')
+        self.assertEqual(len(self.limiter.get_request_stats(ip_address='10.0.0.50')), 0)
+
+        add_old_record()
+        self.limiter.record_request('10.0.0.51')
+        self.assertEqual(len(self.limiter.get_request_stats(ip_address='10.0.0.50')), 1)
+
+    def test_connection_reused_per_thread(self):
+        """Test that each thread reuses its own database connection."""
+        with self.limiter._get_connection() as conn1:
+            pass
+        with self.limiter._get_connection() as conn2:
+            pass
+        self.assertIs(conn1, conn2)
+
+        other = []
+
+        def worker():
+            self.limiter.record_request('10.0.0.40')
+            with self.limiter._get_connection() as conn:
+                other.append(conn)
+            self.limiter.close()
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        self.assertIsNot(other[0], conn1)
+        self.assertEqual(self.limiter.get_ip_request_count('10.0.0.40'), 1)
+
 
 def run_integration_test():
     """Run a simple integration test showing rate limiter in action."""
@@ -329,6 +329,9 @@ ExecStart=$VENV_DIR/bin/gunicorn \\
           --error-logfile '$INSTALL_DIR/gunicorn-errors.txt' \\
           --timeout 120 \\
           --workers 3 \\
+          --worker-class gthread \\
+          --threads 4 \\
+          --preload \\
           --bind unix:$SOCKET_PATH \\
           app:app
 